@@ -105,6 +105,10 @@ DATABASES = {
         "OPTIONS": {
             "sslmode": os.getenv('DB_SSL_MODE')
         },
+        # Reuse connections across requests and Celery tasks instead of reconnecting each time.
+        # Celery's Django fixup closes obsolete/broken connections around every task.
+        "CONN_MAX_AGE": int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        "CONN_HEALTH_CHECKS": True,
         "DISABLE_SERVER_SIDE_CURSORS": True
     }
 }
@@ -333,7 +337,7 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'integrations.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -350,4 +354,7 @@ CACHES = {
     }
 }
 
+# Sessions are read from Redis and only written through to Postgres on change.
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
 
@@ -31,6 +31,15 @@ HIGH_PRIORITY_TASK_SEMAPHORE = "high_priority_data_task_semaphore"
 HIGH_PRIORITY_TASK_ACTIVE_COUNT = "high_priority_data_task_active_count"
 SYSTEM_TASK_ACTIVE_KEY = "high_priority_system_task_active"
 
+def parse_task_date(date_str=None):
+    """
+    Parses a YYYY-MM-DD task argument into a naive midnight datetime.
+    None means today (UTC).
+    """
+    if date_str is None:
+        return datetime.combine(timezone.now().date(), datetime.min.time())
+    return datetime.fromisoformat(date_str)
+
 def acquire_global_lock(timeout=600):
     """
     Acquire a global lock to prevent overlapping task dispatches.
@@ -179,7 +188,7 @@ def sync_organization(self, organization_id):
 @shared_task(bind=True, queue="high_priority")
 def process_high_priority(self, hp_task_id, semaphore_id=None):
     """Process a high priority task, releasing the semaphore when done"""
-    from integrations.models.models import HighPriorityTask, Integration
+    from integrations.models.models import HighPriorityTask
     from integrations.modules import MODULES
 
     # Close any stale connections
@@ -200,12 +209,12 @@ def process_high_priority(self, hp_task_id, semaphore_id=None):
             in_progress_since=timezone.now()
         )
         
-        hp_task = HighPriorityTask.objects.get(pk=hp_task_id)
+        hp_task = HighPriorityTask.objects.select_related('integration').get(pk=hp_task_id)
         
         if hp_task.in_progress and hp_task.in_progress_since and (timezone.now() - hp_task.in_progress_since).total_seconds() > 300:
             logger.warning(f"Task {hp_task_id} has been in progress for more than 5 minutes. Attempting to process anyway.")
             
-        integration = Integration.objects.get(pk=hp_task.integration.id)
+        integration = hp_task.integration
 
         if hp_task.integration_type not in MODULES:
             logger.error(
@@ -4,8 +4,6 @@ Tasks for handling NetSuite integrations including data import and token refresh
 
 import logging
 from celery import shared_task, chain
-from django.utils import timezone
-from datetime import datetime
 import time
 from django.core.cache import cache
 
@@ -16,13 +14,14 @@ from integrations.services.netsuite.auth import NetSuiteAuthService
 from integrations.services.netsuite.importer import NetSuiteImporter 
 from core.tasks.general import SYSTEM_TASK_ACTIVE_KEY  # Import the constant
 from core.tasks.general import log_task_event  # Import log_task_event
+from core.tasks.general import parse_task_date
 
 def get_netsuite_importer(integration_id, since_str=None):
     """
     Instantiate and return a NetSuiteImporter.
     If since_str is not provided, compute today's date at task execution time.
     """
-    integration = Integration.objects.get(pk=integration_id)
+    integration = Integration.objects.select_related("organisation").get(pk=integration_id)
     
     # Validate that we have the required NetSuite settings
     settings = integration.settings or {}
@@ -30,9 +29,7 @@ def get_netsuite_importer(integration_id, since_str=None):
         logger.error(f"Integration {integration_id} missing 'account_id' in settings")
         raise ValueError(f"Integration {integration_id} missing required NetSuite settings")
     
-    if since_str is None:
-        since_str = timezone.now().strftime('%Y-%m-%d')
-    since_date = datetime.strptime(since_str, '%Y-%m-%d')
+    since_date = parse_task_date(since_str)
     return NetSuiteImporter(integration, since_date)
 
 @shared_task
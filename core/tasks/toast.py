@@ -1,9 +1,9 @@
 import logging
 from celery import shared_task
-from django.utils import timezone
-from datetime import timedelta, datetime
+from datetime import timedelta
 from integrations.models.models import Integration  
 from integrations.services.toast.client import ToastIntegrationService
+from core.tasks.general import parse_task_date
 
 logger = logging.getLogger(__name__)
 
@@ -18,29 +18,23 @@ def sync_toast_data(integration_id, start_date_str=None, end_date_str=None, modu
     If not provided, syncs all modules.
     """
     try:
-        integration = Integration.objects.get(pk=integration_id)
+        integration = Integration.objects.select_related("organisation").get(pk=integration_id)
     except Integration.DoesNotExist:
         logger.error("Integration with ID %s does not exist.", integration_id)
         return
 
-    today_str = timezone.now().strftime('%Y-%m-%d')
+    today = parse_task_date()
     try:
-        if start_date_str:
-            start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
-        else:
-            start_date = datetime.strptime(today_str, '%Y-%m-%d')
+        start_date = parse_task_date(start_date_str) if start_date_str else today
     except Exception as e:
         logger.error("Error parsing start_date_str: %s", e)
-        start_date = datetime.strptime(today_str, '%Y-%m-%d')
+        start_date = today
 
     try:
-        if end_date_str:
-            end_date = datetime.strptime(end_date_str, "%Y-%m-%d")
-        else:
-            end_date = datetime.strptime(today_str, '%Y-%m-%d') + timedelta(days=1)
+        end_date = parse_task_date(end_date_str) if end_date_str else today + timedelta(days=1)
     except Exception as e:
         logger.error("Error parsing end_date_str: %s", e)
-        end_date = datetime.strptime(today_str, '%Y-%m-%d') + timedelta(days=1)
+        end_date = today + timedelta(days=1)
 
     logger.info("Syncing Toast data for integration %s from %s to %s",
                 integration_id, start_date, end_date)
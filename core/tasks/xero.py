@@ -3,67 +3,77 @@ Tasks for handling Xero integrations including syncing and data import.
 """
 
 import logging
+import requests
 from celery import shared_task, chain
-from datetime import datetime
+from django.core.cache import cache
 import time
-from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
 from integrations.models.models import Integration
-from integrations.services.xero.xero_client import XeroDataImporter
+from integrations.services.xero.xero_client import XeroDataImporter, XeroRetryableError
+from core.tasks.general import parse_task_date
+
+# Upper bound on how long one integration's sync chain may hold its lock.
+XERO_SYNC_LOCK_TIMEOUT = 2 * 60 * 60
+
+# Each import stage retries on its own when Xero keeps failing a call (429s
+# beyond what the importer waits out, 5xx, dropped connections), so a chain
+# resumes at the failed stage instead of being abandoned. Other HTTP errors
+# (400, 401, 403, 404, the daily limit) won't clear on a retry and fail at once.
+XERO_STAGE_RETRY = dict(
+    autoretry_for=(XeroRetryableError, requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+    retry_backoff=True,
+    max_retries=5,
+)
 
 def get_xero_importer(integration_id, since_str=None, until_str=None):
     """
     Instantiate and return XeroDataImporter.
     The until_str is used to set the until_date for budget imports.
     """
-    integration = Integration.objects.get(pk=integration_id)
+    integration = Integration.objects.select_related("organisation").get(pk=integration_id)
     
     # Check if integration has required credentials in settings
     if not (integration.settings.get('client_id') and integration.settings.get('client_secret')):
         logger.error(f"Integration {integration_id} is missing required Xero credentials")
         raise ValueError("Xero client credentials not set in Integration settings")
         
-    if since_str is None:
-         since_str = timezone.now().strftime('%Y-%m-%d')
-    since_date = datetime.strptime(since_str, '%Y-%m-%d')
-    until_date = None
-    if until_str:
-         until_date = datetime.strptime(until_str, '%Y-%m-%d')
+    since_date = parse_task_date(since_str)
+    until_date = parse_task_date(until_str) if until_str else None
     return XeroDataImporter(integration, since_date, until_date)
 
-@shared_task
+@shared_task(**XERO_STAGE_RETRY)
 def xero_sync_accounts_task(integration_id, since_str=None):
     importer = get_xero_importer(integration_id, since_str)
     importer.sync_xero_chart_of_accounts()
     logger.info(f"Xero accounts synced for integration id: {integration_id}")
 
-@shared_task
+@shared_task(**XERO_STAGE_RETRY)
 def xero_import_journal_lines_task(integration_id, since_str=None):
     importer = get_xero_importer(integration_id, since_str)
     importer.import_xero_journal_lines()
     logger.info(f"Xero journal lines imported for integration id: {integration_id}")
 
-@shared_task
+@shared_task(**XERO_STAGE_RETRY)
 def xero_import_contacts_task(integration_id, since_str=None):
     importer = get_xero_importer(integration_id, since_str)
     importer.import_xero_contacts()
     logger.info(f"Xero contacts imported for integration id: {integration_id}")
 
-@shared_task
+@shared_task(**XERO_STAGE_RETRY)
 def xero_import_invoices_task(integration_id, since_str=None):
     importer = get_xero_importer(integration_id, since_str)
     importer.import_xero_invoices()
     logger.info(f"Xero invoices imported for integration id: {integration_id}")
 
-@shared_task
+@shared_task(**XERO_STAGE_RETRY)
 def xero_import_bank_transactions_task(integration_id, since_str=None):
     importer = get_xero_importer(integration_id, since_str)
     importer.import_xero_bank_transactions()
     logger.info(f"Xero bank transactions imported for integration id: {integration_id}")
 
-@shared_task
+@shared_task(**XERO_STAGE_RETRY)
 def xero_import_budgets_task(integration_id, since_str=None, until_str=None):
     importer = get_xero_importer(integration_id, since_str, until_str)
     importer.import_xero_budgets(until_date=until_str)
@@ -83,6 +93,45 @@ def wait_60_seconds(integration_id):
     time.sleep(20)
     return integration_id
 
+@shared_task
+def release_xero_sync_lock(integration_id):
+    cache.delete(xero_sync_lock_key(integration_id))
+
+
+def xero_sync_lock_key(integration_id):
+    return f"xero_sync_lock_{integration_id}"
+
+
+def dispatch_xero_sync_chain(integration_id, since_str=None):
+    """
+    Dispatches the sequential Xero sync chain for one integration, unless a
+    chain for it is still running. The lock is released when the chain ends,
+    whether it succeeds or fails, and expires on its own as a fallback.
+    Returns True if a chain was dispatched.
+    """
+    if not cache.add(xero_sync_lock_key(integration_id), "in_progress", XERO_SYNC_LOCK_TIMEOUT):
+        logger.warning(f"Xero sync for integration {integration_id} is already running. Skipping.")
+        return False
+
+    task_chain = chain(
+        xero_sync_accounts_task.si(integration_id, since_str),
+        wait_60_seconds.si(integration_id),
+        xero_import_journal_lines_task.si(integration_id, since_str),
+        wait_60_seconds.si(integration_id),
+        xero_import_contacts_task.si(integration_id, since_str),
+        wait_60_seconds.si(integration_id),
+        xero_import_invoices_task.si(integration_id, since_str),
+        wait_60_seconds.si(integration_id),
+        xero_import_bank_transactions_task.si(integration_id, since_str),
+        wait_60_seconds.si(integration_id),
+        xero_import_budgets_task.si(integration_id, since_str),
+        wait_60_seconds.si(integration_id),
+        xero_map_tracking_categories_task.si(integration_id),
+        release_xero_sync_lock.si(integration_id),
+    )
+    task_chain.apply_async(link_error=release_xero_sync_lock.si(integration_id))
+    return True
+
 @shared_task
 def sync_xero_data(since_str: str = None):
     """
@@ -104,23 +153,8 @@ def sync_xero_data(since_str: str = None):
             logger.warning(f"Integration {integration.id} is missing required Xero credentials. Skipping.")
             continue
             
-        task_chain = chain(
-            xero_sync_accounts_task.si(integration.id, since_str),
-            wait_60_seconds.si(integration.id),
-            xero_import_journal_lines_task.si(integration.id, since_str),
-            wait_60_seconds.si(integration.id),
-            xero_import_contacts_task.si(integration.id, since_str),
-            wait_60_seconds.si(integration.id),
-            xero_import_invoices_task.si(integration.id, since_str),
-            wait_60_seconds.si(integration.id),
-            xero_import_bank_transactions_task.si(integration.id, since_str),
-            wait_60_seconds.si(integration.id),
-            xero_import_budgets_task.si(integration.id, since_str),
-            wait_60_seconds.si(integration.id),
-            xero_map_tracking_categories_task.si(integration.id),
-        )
-        task_chain.apply_async()
-        logger.info(f"Dispatched Xero sync tasks for integration: {integration}")
+        if dispatch_xero_sync_chain(integration.id, since_str):
+            logger.info(f"Dispatched Xero sync tasks for integration: {integration}")
 
 @shared_task
 def sync_single_xero_data(integration_id, since_str: str = None):
@@ -139,19 +173,4 @@ def sync_single_xero_data(integration_id, since_str: str = None):
         logger.error(f"Integration {integration_id} not found")
         return
     
-    task_chain = chain( 
-        xero_sync_accounts_task.si(integration_id, since_str),
-        wait_60_seconds.si(integration_id),
-        xero_import_journal_lines_task.si(integration_id, since_str),
-        wait_60_seconds.si(integration_id),
-        xero_import_contacts_task.si(integration_id, since_str),
-        wait_60_seconds.si(integration_id),
-        xero_import_invoices_task.si(integration_id, since_str),
-        wait_60_seconds.si(integration_id),
-        xero_import_bank_transactions_task.si(integration_id, since_str),
-        wait_60_seconds.si(integration_id),
-        xero_import_budgets_task.si(integration_id, since_str),
-        wait_60_seconds.si(integration_id),
-        xero_map_tracking_categories_task.si(integration_id),
-    )
-    task_chain.apply_async() 
\ No newline at end of file
+    dispatch_xero_sync_chain(integration_id, since_str) 
\ No newline at end of file
@@ -1,3 +1,32 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from core.tasks import xero as xero_tasks
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class XeroSyncLockTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(xero_tasks, "chain")
+        self.chain = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_second_sync_is_skipped_while_one_is_running(self):
+        self.assertTrue(xero_tasks.dispatch_xero_sync_chain(1))
+        self.assertFalse(xero_tasks.dispatch_xero_sync_chain(1))
+        self.assertTrue(xero_tasks.dispatch_xero_sync_chain(2))
+        self.assertEqual(self.chain.return_value.apply_async.call_count, 2)
+
+    def test_lock_is_released_when_the_chain_ends_or_fails(self):
+        xero_tasks.dispatch_xero_sync_chain(1)
+        release = xero_tasks.release_xero_sync_lock.si(1)
+        self.assertEqual(self.chain.call_args.args[-1], release)
+        self.chain.return_value.apply_async.assert_called_once_with(link_error=release)
+
+        xero_tasks.release_xero_sync_lock(1)
+        self.assertTrue(xero_tasks.dispatch_xero_sync_chain(1))
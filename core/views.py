@@ -9,7 +9,6 @@ import logging
 from django.db import connection
 from django.conf import settings
 from django.contrib.admin.views.decorators import staff_member_required
-from integrations.services.xero.xero_client import XeroDataImporter
 
 
 logger = logging.getLogger(__name__)
@@ -90,22 +89,19 @@ def import_budgets_view(request):
             since_date = form.cleaned_data['since_date']
             until_date = form.cleaned_data['until_date']
             
-            # Process the budget import directly
-            try:
-                # Create importer instance with date range
-                importer = XeroDataImporter(integration, since_date)
-                # Import budgets with the until_date
-                importer.import_xero_budgets(until_date=until_date)
-                
-                messages.success(
-                    request,
-                    f"Successfully imported Xero budget data for {integration.organisation.name} from {since_date} to {until_date}"
-                )
-            except Exception as e:
-                messages.error(
-                    request,
-                    f"Error importing Xero budget data: {str(e)}"
-                )
+            HighPriorityTask.objects.create(
+                integration=integration,
+                integration_type='xero',
+                since_date=since_date,
+                selected_modules=['budgets'],
+                processed=False,
+                until_date=until_date
+            )
+
+            messages.info(
+                request,
+                "High priority budget import record has been created. It will be processed shortly."
+            )
             return redirect("admin:index")
     else:
         form = BudgetImportForm()
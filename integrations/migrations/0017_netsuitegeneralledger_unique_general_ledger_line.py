@@ -0,0 +1,54 @@
+# Generated by Django 4.2 on 2026-10-18 09:07
+
+from django.db import migrations, models
+
+# Removes duplicate general ledger lines left by the old per-row import so the
+# unique constraint can be added. Lines are deduped first by NetSuite's
+# uniquekey, which identifies one transaction line, then by the new conflict
+# key. Each group keeps one row: preferably one whose transaction_id isn't just
+# the line id, then the most recently inserted.
+DEDUPE_GENERAL_LEDGER_SQL = [
+    """
+    DELETE FROM integrations_netsuitegeneralledger
+    WHERE id IN (
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY tenant_id, line_unique_key
+                ORDER BY transaction_id IS NOT DISTINCT FROM transaction_line_id, id DESC
+            ) AS rn
+            FROM integrations_netsuitegeneralledger
+            WHERE line_unique_key IS NOT NULL
+        ) ranked
+        WHERE rn > 1
+    )
+    """,
+    """
+    DELETE FROM integrations_netsuitegeneralledger
+    WHERE id IN (
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY tenant_id, transaction_id, transaction_line_id
+                ORDER BY id DESC
+            ) AS rn
+            FROM integrations_netsuitegeneralledger
+            WHERE transaction_id IS NOT NULL AND transaction_line_id IS NOT NULL
+        ) ranked
+        WHERE rn > 1
+    )
+    """,
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0016_remove_toastrefund_integration'),
+    ]
+
+    operations = [
+        migrations.RunSQL(DEDUPE_GENERAL_LEDGER_SQL, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='netsuitegeneralledger',
+            constraint=models.UniqueConstraint(fields=('tenant', 'transaction_id', 'transaction_line_id'), name='unique_general_ledger_line'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 09:18
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0017_netsuitegeneralledger_unique_general_ledger_line'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='xerojournallinetrackingcategories',
+            unique_together={('tenant_id', 'journal_line_id', 'tracking_category_id')},
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2 on 2026-10-18 09:23
+
+from django.db import migrations, models
+
+# Keeps only the most recently inserted row per line_item_id so the unique
+# constraint can be added. Xero LineItemIDs are GUIDs, so repeated rows are
+# earlier imports of the same invoice or bank transaction line.
+DEDUPE_LINE_ITEMS_SQL = """
+    DELETE FROM integrations_xeroinvoicelineitems
+    WHERE id IN (
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (PARTITION BY line_item_id ORDER BY id DESC) AS rn
+            FROM integrations_xeroinvoicelineitems
+        ) ranked
+        WHERE rn > 1
+    )
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0018_alter_xerojournallinetrackingcategories_unique_together'),
+    ]
+
+    operations = [
+        migrations.RunSQL(DEDUPE_LINE_ITEMS_SQL, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='xeroinvoicelineitems',
+            constraint=models.UniqueConstraint(fields=('line_item_id',), name='unique_xero_line_item'),
+        ),
+    ]
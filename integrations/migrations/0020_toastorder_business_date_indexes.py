@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-18 09:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0019_xeroinvoicelineitems_unique_xero_line_item'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='toastorder',
+            index=models.Index(fields=['business_date', 'restaurant_guid'], name='integration_busines_41a6c3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='toastorder',
+            index=models.Index(fields=['refund_business_date', 'restaurant_guid'], name='integration_refund__cdf837_idx'),
+        ),
+    ]
@@ -604,6 +604,12 @@ class NetSuiteGeneralLedger(models.Model):
             models.Index(fields=['tenant_id', 'transaction_id','transaction_line_id']),
             models.Index(fields=['tenant_id', 'line_unique_key']),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tenant', 'transaction_id', 'transaction_line_id'],
+                name='unique_general_ledger_line'
+            )
+        ]
 
     
 
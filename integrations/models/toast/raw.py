@@ -68,6 +68,8 @@ class ToastOrder(models.Model):
             models.Index(fields=["modified_date"]),
             models.Index(fields=["payments"]),
             models.Index(fields=["site"]),
+            models.Index(fields=["business_date", "restaurant_guid"]),
+            models.Index(fields=["refund_business_date", "restaurant_guid"]),
         ]
 
 
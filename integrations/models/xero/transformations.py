@@ -52,6 +52,7 @@ class XeroJournalLineTrackingCategories(models.Model):
 
     class Meta:
         verbose_name = "Xero Journal Line Tracking Category"
+        unique_together = (('tenant_id', 'journal_line_id', 'tracking_category_id'), )
         indexes = [
             models.Index(fields=['tenant_id']),
             models.Index(fields=['journal_line_id']),
@@ -104,6 +105,12 @@ class XeroInvoiceLineItems(models.Model):
             models.Index(fields=['line_item_id']),
             models.Index(fields=['invoice_id']),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['line_item_id'],
+                name='unique_xero_line_item'
+            )
+        ]
 
     def __str__(self):
         return f"{self.invoice_id} - {self.line_item_id}"
@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Keyset pagination on the primary key for the high-volume raw tables.
+    Each page is an indexed `id < cursor` range scan, with no COUNT(*) and
+    no OFFSET that grows with the page number.
+    """
+    ordering = '-id'
+
+
+class JournalLineCursorPagination(IdCursorPagination):
+    """Keyset pagination for XeroJournalLines, whose primary key is journal_line_id."""
+    ordering = '-journal_line_id'
@@ -1,3 +1,5 @@
+import threading
+
 import requests
 import jwt 
 from django.utils import timezone
@@ -8,6 +10,25 @@ from integrations.models.models import Integration, IntegrationAccessToken
 
 INTEGRATION_TYPE_NETSUITE = "NETSUITE"
 
+# One session per thread, shared across the NetSuiteAuthService instances that
+# thread builds, so token calls reuse a kept-alive TLS connection to the
+# account's token host. requests.Session isn't thread-safe, hence not one per process.
+_token_sessions = threading.local()
+TOKEN_REQUEST_TIMEOUT = (5, 30)
+
+
+def get_token_session() -> requests.Session:
+    """Returns the calling thread's session for token requests, created on first use."""
+    session = getattr(_token_sessions, "session", None)
+    if session is None:
+        session = _token_sessions.session = requests.Session()
+    return session
+
+
+class NetSuiteTokenMissing(Exception):
+    """No NetSuite access token has been obtained for the integration yet."""
+
+
 class NetSuiteAuthService:
     """
     Handles NetSuite OAuth2 (Machine-to-Machine) authentication for a given NetSuite account.
@@ -84,7 +105,7 @@ class NetSuiteAuthService:
             "client_assertion": client_assertion
         }
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        resp = requests.post(self.token_url, data=data, headers=headers)
+        resp = get_token_session().post(self.token_url, data=data, headers=headers, timeout=TOKEN_REQUEST_TIMEOUT)
         if resp.status_code != 200:
             raise Exception(f"NetSuite M2M token request failed: {resp.status_code} {resp.text}")
         
@@ -119,12 +140,11 @@ class NetSuiteAuthService:
         Returns the saved NetSuite access_token. If it is not present,
         the user must manually obtain a token (via obtain_access_token).
         """
-        try:
-            token_obj = IntegrationAccessToken.objects.get(
-                integration=self.integration,
-                integration_type=INTEGRATION_TYPE_NETSUITE
-            )
-        except IntegrationAccessToken.DoesNotExist:
-            raise Exception("No NetSuite token found. Please obtain a token first via M2M authentication.")
-
-        return token_obj.token
\ No newline at end of file
+        token = IntegrationAccessToken.objects.filter(
+            integration=self.integration,
+            integration_type=INTEGRATION_TYPE_NETSUITE
+        ).values_list("token", flat=True).first()
+        if token is None:
+            raise NetSuiteTokenMissing("No NetSuite token found. Please obtain a token first via M2M authentication.")
+
+        return token
\ No newline at end of file
@@ -1,4 +1,5 @@
 from typing import Dict, Iterator, Optional
+import orjson
 import requests
 from django.conf import settings
 from .auth import NetSuiteAuthService
@@ -22,6 +23,8 @@ class NetSuiteClient:
         self.auth_service = NetSuiteAuthService(integration)
         # Here we simply use the saved access token. No auto-refresh is performed.
         self.token = self.auth_service.get_access_token()
+        # SuiteQL is paged, so one import makes many calls to the same host; reuse the connection.
+        self.session = requests.Session()
 
     def execute_suiteql(
         self,
@@ -41,15 +44,15 @@ class NetSuiteClient:
         if min_id is not None:
             query = query.replace("$min", str(min_id))
         data = {"q": query}
-        logger.debug(f"Executing SuiteQL Query: {query}")
-        logger.debug(f"With params: {params}")
+        logger.debug("Executing SuiteQL Query: %s", query)
+        logger.debug("With params: %s", params)
 
-        response = requests.post(url, headers=headers, json=data, params=params)
+        response = self.session.post(url, headers=headers, json=data, params=params)
         if response.status_code != 200:
             raise Exception(f"SuiteQL Request Failed: {response.status_code} - {response.text}")
 
-        results = response.json()
-        logger.debug(f"SuiteQL Query Results: {results}")
+        results = orjson.loads(response.content)
+        logger.debug("SuiteQL Query Results: %s", results)
         yield from results.get('items', [])
     
     
\ No newline at end of file
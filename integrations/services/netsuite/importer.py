@@ -5,10 +5,13 @@ from datetime import datetime, date, timezone as dt_timezone
 from typing import Optional
 
 from django.db import close_old_connections, transaction
+from django.db.models import F
 from django.utils import timezone
 from dateutil import tz
 from dateutil.parser import parse as dateutil_parse
-from integrations.services.utils import BatchUtils, compute_unique_key
+from integrations.services.utils import (
+    BatchUtils, compute_unique_key, BULK_INSERT_BATCH_SIZE, CLOSE_CONNECTIONS_EVERY
+)
 
 from .client import NetSuiteClient
 from integrations.models.models import Integration, SyncTableLogs, Organisation
@@ -31,6 +34,13 @@ from core.models import Site, IntegrationSiteMapping
 
 logger = logging.getLogger(__name__)
 
+# Conflict key and refreshed columns for the general ledger upsert.
+GENERAL_LEDGER_UNIQUE_FIELDS = ("tenant", "transaction_id", "transaction_line_id")
+GENERAL_LEDGER_UPDATE_FIELDS = tuple(
+    f.name for f in NetSuiteGeneralLedger._meta.concrete_fields
+    if not f.primary_key and f.name not in GENERAL_LEDGER_UNIQUE_FIELDS
+)
+
 
 def bool_from_str(val: Optional[str]) -> bool:
     """Convert 'T'/'F' (or similar) strings to boolean."""
@@ -300,8 +310,12 @@ class NetSuiteImporter:
         limit = 1000
         total_imported = 0
 
+        pages_fetched = 0
         while True:
-            close_old_connections()
+            # Connections are checked every few pages rather than before each one.
+            if pages_fetched % CLOSE_CONNECTIONS_EVERY == 0:
+                close_old_connections()
+            pages_fetched += 1
             date_clause = self.build_date_clause("lastmodifieddate", self.since_date, self.until_date)
             query = f"""
             SELECT *
@@ -539,8 +553,11 @@ class NetSuiteImporter:
         date_filter_clause = self.build_date_clause("LINELASTMODIFIEDDATE", since=last_modified_after or start_date, until=end_date)
 
         line_counter = 0
+        pages_fetched = 0
         while True:
-            close_old_connections()
+            if pages_fetched % CLOSE_CONNECTIONS_EVERY == 0:
+                close_old_connections()
+            pages_fetched += 1
             # Build query using composite conditions.
             # It selects lines where either the transaction is greater than the last fetched
             # or where the transaction equals the last fetched and the uniquekey is greater.
@@ -681,8 +698,11 @@ class NetSuiteImporter:
             if end_date:
                 date_filter_clause += f" AND LASTMODIFIEDDATE <= TO_DATE('{end_date}', 'YYYY-MM-DD HH24:MI:SS')"
 
+        pages_fetched = 0
         while True:
-            close_old_connections()
+            if pages_fetched % CLOSE_CONNECTIONS_EVERY == 0:
+                close_old_connections()
+            pages_fetched += 1
             query = f"""
                 SELECT
                     TRANSACTION,
@@ -899,101 +919,132 @@ class NetSuiteImporter:
             # with open('GLdata.json', 'w') as f:
             #     import json
             #     json.dump(rows, f,indent=4)
-        def processRow(r):
-            try:
-                # print(f"Processing transaction accounting line: {r.get('uniquekey')}")
-                last_modified = self.parse_datetime(r.get("lastmodifieddate"))
-                NetSuiteGeneralLedger.objects.update_or_create(
-                    transaction_line_id=r.get("lineid"),
-                    transaction_id=r.get("transaction"),
-                    tenant_id=self.org.id,
-                    defaults={
-                        "tenant_id": self.org.id,
-                        "type": r.get("abbrevtype"),
-                        'account_id': r.get("accountid"),
-                        "account_name": r.get("account"),
-                        "accounting_line_type": r.get("accountinglinetype"),
-                        "approval_status": r.get("approvalstatus"),
-                        "balance_segment_status": r.get("balsegstatus"),
-                        "billing_status": r.get("billingstatus"),
-                        "cleared": r.get("cleared"),
-                        "close_date": self.parse_date(r.get("closedate")),
-                        "comitment_firm": r.get("commitmentfirm"),
-                        "created_by": r.get("createdby"),
-                        "created_date": self.parse_date(r.get("createddate")),
-                        "credit_amount": decimal_or_none(r.get("credit")),
-                        "credit_foreign_amount": decimal_or_none(r.get("creditforeignamount")),
-                        "currency": r.get("currency"),
-                        "debit_amount": decimal_or_none(r.get("debit")),
-                        "document_number": r.get("documentnumber"),
-                        "due_date": self.parse_date(r.get("duedate")),
-                        "department": r.get("department"),
-                        "department_id": r.get("departmentid"),
-                        "entity": r.get("entity"),
-                        "entity_id": r.get("entityid"),
-                        "exchange_rate": decimal_or_none(r.get("exchangerate")),
-                        "expense_account": r.get("expenseaccount"),
-                        "expense_account_id": r.get("expenseaccountid"),
-                        "external_id": r.get("externalid"),
-                        "foreign_amount": decimal_or_none(r.get("foreignamount")),
-                        "foreign_amount_paid": decimal_or_none(r.get("foreignamountpaid")),
-                        "foreign_amount_unpaid": decimal_or_none(r.get("foreignamountunpaid")),
-                        "foreign_total": decimal_or_none(r.get("foreigntotal")),
-                        "transaction_id" : r.get("id"),
-                        "transaction_line_id": r.get("lineid"),
-                        "is_billable": r.get("isbillable"),
-                        "is_closed": r.get("isclosed"),
-                        "is_cogs": r.get("iscogs"),
-                        "is_custom_gl_line": r.get("iscustomglline"),
-                        "is_fully_shipped": r.get("isfullyshipped"),
-                        "is_inventory_affecting": r.get("isinventoryaffecting"),
-                        "is_reversal": r.get("isreversal"),
-                        "is_rev_rec_transaction": r.get("isrevrectransaction"),
-                        "last_modified_date": last_modified,
-                        "last_modified_by": r.get("lastmodifiedby"),
-                        "line_sequence_number": r.get("linesequencenumber"),
-                        "match_bill_to_receipt": r.get("matchbilltoreceipt"),
-                        "memo": r.get("memo"),
-                        "net_amount": decimal_or_none(r.get("netamount")),
-                        "nexus": r.get("nexus"),
-                        "number": r.get("number"),
-                        "payment_hold": r.get("paymenthold"),
-                        "posting": r.get("posting"),
-                        "posting_period": r.get("postingperiod"),
-                        "quantity_billed": decimal_or_none(r.get("quantitybilled")),
-                        "quantity_rejected": decimal_or_none(r.get("quantityrejected")),
-                        "quantity_ship_recv": decimal_or_none(r.get("quantityshiprecv")),
-                        "record_type": r.get("recordtype"),
-                        "source": r.get("source"),
-                        "status": r.get("status"),
-                        "subsidiary": r.get("subsidiary"),
-                        "subsidiary_id": r.get("subsidiaryid"),
-                        "tax_line": r.get("taxline"),
-                        "transaction_discount": r.get("transactiondiscount"),
-                        "transaction_number": r.get("transactionnumber"),
-                        "tran_date": self.parse_date(r.get("trandate")),
-                        "tran_display_name": r.get("trandisplayname"),
-                        "tran_id": r.get("tranid"),
-                        "line_unique_key": r.get("uniquekey"),
-                        "void": r.get("void"),
-                        "voided": r.get("voided"),
-                    })
-            except Exception as e:
-                logger.error(f"Error importing transaction accounting line row: {e}", exc_info=True)
-                return
-        
+        tenant_id = self.org.id
+
+        def build_row(r):
+            return NetSuiteGeneralLedger(
+                tenant_id=tenant_id,
+                transaction_id=r.get("transaction"),
+                transaction_line_id=r.get("lineid"),
+                type=r.get("abbrevtype"),
+                account_id=r.get("accountid"),
+                account_name=r.get("account"),
+                accounting_line_type=r.get("accountinglinetype"),
+                approval_status=r.get("approvalstatus"),
+                balance_segment_status=r.get("balsegstatus"),
+                billing_status=r.get("billingstatus"),
+                cleared=r.get("cleared"),
+                close_date=self.parse_date(r.get("closedate")),
+                comitment_firm=r.get("commitmentfirm"),
+                created_by=r.get("createdby"),
+                created_date=self.parse_date(r.get("createddate")),
+                credit_amount=decimal_or_none(r.get("credit")),
+                credit_foreign_amount=decimal_or_none(r.get("creditforeignamount")),
+                currency=r.get("currency"),
+                debit_amount=decimal_or_none(r.get("debit")),
+                document_number=r.get("documentnumber"),
+                due_date=self.parse_date(r.get("duedate")),
+                department=r.get("department"),
+                department_id=r.get("departmentid"),
+                entity=r.get("entity"),
+                entity_id=r.get("entityid"),
+                exchange_rate=decimal_or_none(r.get("exchangerate")),
+                expense_account=r.get("expenseaccount"),
+                expense_account_id=r.get("expenseaccountid"),
+                external_id=r.get("externalid"),
+                foreign_amount=decimal_or_none(r.get("foreignamount")),
+                foreign_amount_paid=decimal_or_none(r.get("foreignamountpaid")),
+                foreign_amount_unpaid=decimal_or_none(r.get("foreignamountunpaid")),
+                foreign_total=decimal_or_none(r.get("foreigntotal")),
+                is_billable=r.get("isbillable"),
+                is_closed=r.get("isclosed"),
+                is_cogs=r.get("iscogs"),
+                is_custom_gl_line=r.get("iscustomglline"),
+                is_fully_shipped=r.get("isfullyshipped"),
+                is_inventory_affecting=r.get("isinventoryaffecting"),
+                is_reversal=r.get("isreversal"),
+                is_rev_rec_transaction=r.get("isrevrectransaction"),
+                last_modified_date=self.parse_datetime(r.get("lastmodifieddate")),
+                last_modified_by=r.get("lastmodifiedby"),
+                line_sequence_number=r.get("linesequencenumber"),
+                match_bill_to_receipt=r.get("matchbilltoreceipt"),
+                memo=r.get("memo"),
+                net_amount=decimal_or_none(r.get("netamount")),
+                nexus=r.get("nexus"),
+                number=r.get("number"),
+                payment_hold=r.get("paymenthold"),
+                posting=r.get("posting"),
+                posting_period=r.get("postingperiod"),
+                quantity_billed=decimal_or_none(r.get("quantitybilled")),
+                quantity_rejected=decimal_or_none(r.get("quantityrejected")),
+                quantity_ship_recv=decimal_or_none(r.get("quantityshiprecv")),
+                record_type=r.get("recordtype"),
+                source=r.get("source"),
+                status=r.get("status"),
+                subsidiary=r.get("subsidiary"),
+                subsidiary_id=r.get("subsidiaryid"),
+                tax_line=r.get("taxline"),
+                transaction_discount=r.get("transactiondiscount"),
+                transaction_number=r.get("transactionnumber"),
+                tran_date=self.parse_date(r.get("trandate")),
+                tran_display_name=r.get("trandisplayname"),
+                tran_id=r.get("tranid"),
+                line_unique_key=r.get("uniquekey"),
+                void=r.get("void"),
+                voided=r.get("voided"),
+            )
+
         print("total  Rows fetched: ", total_imported)
-        for rows in total_data:
-            #pulling the data from the list and processing it in batches
+        failed_pages = []
+        for page_number, rows in enumerate(total_data, start=1):
+            # One INSERT ... ON CONFLICT DO UPDATE per page instead of a
+            # SELECT + INSERT/UPDATE round trip per row. Rows are keyed so a
+            # line repeated within a page does not hit the same row twice.
+            objs = {}
+            failures = []
             for row in rows:
-                # processing each row inside the batch
-                # using single rather than batch import as the data might be too large sometime
-                processRow(row)
-                
-
+                try:
+                    obj = build_row(row)
+                except Exception as e:
+                    # One traceback per page, not per row, when a whole page is malformed.
+                    if not failures:
+                        logger.exception("Error importing general ledger row %s", row.get("uniquekey"))
+                    failures.append((row.get("uniquekey"), repr(e)))
+                    continue
+                if obj.transaction_id is None or obj.transaction_line_id is None:
+                    # A NULL key never conflicts, so the row would be inserted again on every run.
+                    failures.append((row.get("uniquekey"), "missing transaction or lineid"))
+                    continue
+                objs[(obj.transaction_id, obj.transaction_line_id)] = obj
+            if failures:
+                logger.error("General ledger page: %d rows failed, first: %s", len(failures), failures[:5])
 
+            try:
+                with transaction.atomic():
+                    # Rows from the old import may carry the line id as transaction_id;
+                    # drop those for the lines being written so they aren't doubled.
+                    NetSuiteGeneralLedger.objects.filter(
+                        tenant_id=self.org.id,
+                        line_unique_key__in=[obj.line_unique_key for obj in objs.values() if obj.line_unique_key],
+                        transaction_id=F("transaction_line_id"),
+                    ).delete()
+                    NetSuiteGeneralLedger.objects.bulk_create(
+                        list(objs.values()),
+                        update_conflicts=True,
+                        unique_fields=GENERAL_LEDGER_UNIQUE_FIELDS,
+                        update_fields=GENERAL_LEDGER_UPDATE_FIELDS,
+                        batch_size=BULK_INSERT_BATCH_SIZE,
+                    )
+            except Exception as e:
+                # A page that fails to save is skipped so the rest of the import still lands.
+                logger.exception("Error saving general ledger page %d (%d rows)", page_number, len(objs))
+                failed_pages.append((page_number, len(objs), repr(e)))
+        if failed_pages:
+            logger.error(
+                "General ledger import: %d of %d pages failed to save, first: %s",
+                len(failed_pages), len(total_data), failed_pages[:5],
+            )
 
-        
 
 
 
@@ -1058,16 +1109,33 @@ class NetSuiteImporter:
                     full_name = r.get("fullname")
                     is_inactive = bool_from_str(r.get("isinactive"))
                     status = 'inactive' if is_inactive else 'active'
+                    last_modified = self.parse_datetime(r.get("lastmodifieddate"))
+                    mapping_settings = {
+                        "include_children": bool_from_str(r.get("includechildren")),
+                        "parent_location_id": r.get("parent"),
+                        "subsidiary_id": r.get("subsidiary"),
+                        "last_modified_date": last_modified.isoformat() if last_modified else None,
+                        "netsuite_external_id": r.get("externalid"),
+                    }
                     
                     try:
-                        mapping = IntegrationSiteMapping.objects.get(
+                        mapping = IntegrationSiteMapping.objects.select_related("site").get(
                             integration=self.integration,
                             external_id=location_id
                         )
+                        # Only write rows whose values actually changed.
                         site = mapping.site
-                        site.name = location_name
-                        site.status = status
-                        site.save(update_fields=["name", "status", "updated_at"])
+                        if site.name != location_name or site.status != status:
+                            site.name = location_name
+                            site.status = status
+                            site.save(update_fields=["name", "status", "updated_at"])
+
+                        if mapping.external_name != full_name or any(
+                            mapping.settings.get(key) != value for key, value in mapping_settings.items()
+                        ):
+                            mapping.external_name = full_name
+                            mapping.settings.update(mapping_settings)
+                            mapping.save(update_fields=["external_name", "settings", "updated_at"])
                         
                     except IntegrationSiteMapping.DoesNotExist:
                         today = timezone.now().date()
@@ -1100,25 +1168,9 @@ class NetSuiteImporter:
                             integration=self.integration,
                             external_id=location_id,
                             external_name=full_name,
-                            settings={
-                                "include_children": bool_from_str(r.get("includechildren")),
-                                "parent_location_id": r.get("parent"),
-                                "subsidiary_id": r.get("subsidiary"),
-                                "last_modified_date": self.parse_datetime(r.get("lastmodifieddate")).isoformat() if self.parse_datetime(r.get("lastmodifieddate")) else None,
-                                "netsuite_external_id": r.get("externalid"),
-                            }
+                            settings=mapping_settings,
                         )
                     
-                    mapping.external_name = full_name
-                    mapping.settings.update({
-                        "include_children": bool_from_str(r.get("includechildren")),
-                        "parent_location_id": r.get("parent"),
-                        "subsidiary_id": r.get("subsidiary"),
-                        "last_modified_date": self.parse_datetime(r.get("lastmodifieddate")).isoformat() if self.parse_datetime(r.get("lastmodifieddate")) else None,
-                        "netsuite_external_id": r.get("externalid"),
-                    })
-                    mapping.save(update_fields=["external_name", "settings", "updated_at"])
-                    
                     logger.info(f"Processed NetSuite location {location_id}: {location_name}")
                 
             except Exception as e:
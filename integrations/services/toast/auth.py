@@ -7,11 +7,12 @@ class ToastAuthService:
     """
     Handles authentication with the Toast API.
     """
-    def __init__(self, hostname, client_id, client_secret):
+    def __init__(self, hostname, client_id, client_secret, session=None):
         self.hostname = hostname.rstrip('/')
         self.client_id = client_id
         self.client_secret = client_secret
         self.token = None
+        self.session = session or requests.Session()
 
     def login(self):
         """
@@ -24,7 +25,7 @@ class ToastAuthService:
             "userAccessType": "TOAST_MACHINE_CLIENT"
         }
         try:
-            response = requests.post(url, json=payload)
+            response = self.session.post(url, json=payload)
             response.raise_for_status()
             data = response.json()
             self.token = data.get("token")["accessToken"]
@@ -1,7 +1,9 @@
+import orjson
 import requests
 import logging
 from datetime import datetime, time , timedelta
 from decimal import Decimal
+from django.core.cache import cache
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from django.db import transaction
@@ -19,6 +21,18 @@ import time as timeclock
 
 logger = logging.getLogger(__name__)
 
+# Bumped after every order import so cached sales summaries are recomputed.
+SALES_SUMMARY_VERSION_KEY = "toast:sales-summary:version"
+
+
+def invalidate_sales_summary_cache():
+    """Moves SalesSummaryAPIView onto a fresh set of cache keys."""
+    try:
+        cache.incr(SALES_SUMMARY_VERSION_KEY)
+    except ValueError:
+        cache.set(SALES_SUMMARY_VERSION_KEY, 1, None)
+
+
 class ToastIntegrationService:
     """
     Provides utility methods for interacting with the Toast API.
@@ -28,7 +42,10 @@ class ToastIntegrationService:
         self.hostname = integration.settings.get('api_url')
         self.client_id = integration.settings.get('client_id')
         self.client_secret = integration.settings.get('client_secret')
-        self.auth_service = ToastAuthService(self.hostname, self.client_id, self.client_secret)
+        # Shared session so repeated calls to the same Toast host, logins included,
+        # reuse one keep-alive connection.
+        self.session = requests.Session()
+        self.auth_service = ToastAuthService(self.hostname, self.client_id, self.client_secret, session=self.session)
         self.access_token = self.auth_service.login()
         self.start_date = start_date
         self.end_date = end_date
@@ -43,7 +60,7 @@ class ToastIntegrationService:
             "userAccessType": "TOAST_MACHINE_CLIENT"
         }
         try:
-            response = requests.get(url, headers=headers, json=payload)
+            response = self.session.get(url, headers=headers, json=payload)
             response.raise_for_status()
             data = response.json()
             if isinstance(data, list) and data:
@@ -138,7 +155,7 @@ class ToastIntegrationService:
                 "Toast-Restaurant-External-ID": restaurant_guid
             }
             try:
-                response = requests.get(url, headers=headers)
+                response = self.session.get(url, headers=headers)
                 response.raise_for_status()
                 data = response.json()
             except requests.RequestException as e:
@@ -176,10 +193,15 @@ class ToastIntegrationService:
             ).first()
             
             if site:
-                # Update existing site
-                for key, value in site_defaults.items():
-                    setattr(site, key, value)
-                site.save()
+                # Update existing site, writing only the fields that changed
+                changed_fields = [
+                    key for key, value in site_defaults.items()
+                    if getattr(site, key) != value
+                ]
+                if changed_fields:
+                    for key in changed_fields:
+                        setattr(site, key, site_defaults[key])
+                    site.save(update_fields=changed_fields + ["updated_at"])
             else:
                 # Create new site
                 site = Site.objects.create(
@@ -364,7 +386,7 @@ class ToastIntegrationService:
                 
                 while retry_count <= max_retries:
                     try:
-                        response = requests.get(url, headers=headers, params=params)
+                        response = self.session.get(url, headers=headers, params=params)
                         response.raise_for_status()
                         data = response.json()
                         orders_batch = data 
@@ -594,6 +616,15 @@ class ToastIntegrationService:
 
                     selection_count = len(check_data.get("selections", []))
                     
+                    # One query for all selections already stored for this check.
+                    existing_selections = {
+                        selection.selection_guid: selection
+                        for selection in ToastSelection.objects.filter(
+                            tenant_id=self.integration.organisation.id,
+                            selection_guid__in=[s.get("guid") for s in check_data.get("selections", [])]
+                        )
+                    }
+
                     selection_index = 0
                     for selection_data in check_data.get("selections", []):
                         try:
@@ -645,13 +676,10 @@ class ToastIntegrationService:
                             }
                          
 
-                            try:
-                                selection_obj = ToastSelection.objects.get(
-                                    selection_guid=selection_guid,
-                                    tenant_id=self.integration.organisation.id
-                                )
-                                for key, value in selection_defaults.items():
-                                    setattr(selection_obj, key, value)
+                            selection_obj = existing_selections.get(selection_guid)
+                            if selection_obj is not None:
+                                # selection_defaults only holds plain columns, so no descriptors are bypassed.
+                                selection_obj.__dict__.update(selection_defaults)
                                 selection_obj.order_guid = order_guid
                                 selection_obj.toast_check = check_obj 
                                 selection_obj.display_name = selection_data.get("displayName")
@@ -661,8 +689,8 @@ class ToastIntegrationService:
                                 selection_obj.quantity = quantity
                                 selection_obj.business_date = order_data["businessDate"]
                                 selection_obj.save()
-                            except ToastSelection.DoesNotExist:
-                                ToastSelection.objects.create(
+                            else:
+                                existing_selections[selection_guid] = ToastSelection.objects.create(
                                     selection_guid=selection_guid,
                                     toast_check=check_obj,
                                     tenant_id=self.integration.organisation.id,
@@ -700,10 +728,8 @@ class ToastIntegrationService:
                 order.discount_count = discount_count
                 if refund_business_date:
                     order.refund_business_date = refund_business_date
-                order.save()
-
                 order.payload = order_data
-                order.save(update_fields=['payload'])
+                order.save()
 
             except Exception as e:
                 print(f"ERROR processing order {order_guid}: {str(e)}")
@@ -713,6 +739,7 @@ class ToastIntegrationService:
         print(f"Finished processing all {len(orders)} orders")
         logger.info(f"Imported {len(orders)} orders")
         self.log_import_event(module_name="toast_orders", fetched_records=len(orders))
+        invalidate_sales_summary_cache()
 
 
     def import_revenue_centers(self):
@@ -735,7 +762,7 @@ class ToastIntegrationService:
             }
             
             try:
-                response = requests.get(url, headers=headers)
+                response = self.session.get(url, headers=headers)
                 response.raise_for_status()
                 centers = response.json()
                 
@@ -785,7 +812,7 @@ class ToastIntegrationService:
             }
             
             try:
-                response = requests.get(url, headers=headers)
+                response = self.session.get(url, headers=headers)
                 response.raise_for_status()
                 services = response.json()
                 
@@ -834,7 +861,7 @@ class ToastIntegrationService:
             }
             
             try:
-                response = requests.get(url, headers=headers)
+                response = self.session.get(url, headers=headers)
                 response.raise_for_status()
                 categories = response.json()
                 
@@ -883,7 +910,7 @@ class ToastIntegrationService:
             }
             
             try:
-                response = requests.get(url, headers=headers)
+                response = self.session.get(url, headers=headers)
                 response.raise_for_status()
                 options = response.json()
                 
@@ -935,7 +962,7 @@ class ToastIntegrationService:
             }
             
             try:
-                response = requests.get(url, headers=headers)
+                response = self.session.get(url, headers=headers)
                 response.raise_for_status()
                 areas = response.json()
                 
@@ -997,7 +1024,10 @@ class ToastIntegrationService:
         
         total_payments = 0
         
-        for order in orders_with_payments:
+        # iterator() skips the queryset cache, so only one chunk of orders is built into
+        # model instances at a time. Server-side cursors are disabled in settings, so the
+        # raw rows still arrive from the database in one result set.
+        for order in orders_with_payments.iterator(chunk_size=2000):
             restaurant_guid = order.restaurant_guid
             if not restaurant_guid:
                 logger.warning(f"Order {order.order_guid} has no restaurant GUID, skipping payment import")
@@ -1066,7 +1096,7 @@ class ToastIntegrationService:
         }
         
         try:
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url, headers=headers)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -1105,7 +1135,7 @@ class ToastIntegrationService:
             orders = []
             while True:
                 print(f"Fetching orders for restaurant with GUID: {restaurant_guid}")
-                response = requests.get(
+                response = self.session.get(
                     f"{self.hostname}/orders/v2/ordersBulk",
                     headers={
                         "Authorization": f"Bearer {self.access_token}",
@@ -1128,7 +1158,7 @@ class ToastIntegrationService:
                     print(f"Error fetching orders: {response.text}")
                     break
 
-                resp_orders = response.json()
+                resp_orders = orjson.loads(response.content)
 
                 if not resp_orders:
                     print("No more orders to fetch.")
@@ -1311,20 +1341,23 @@ class ToastIntegrationService:
             
             # print(f"restaurant guid: {order_data.get('restaurant_guid')}")
             try:
-                order_update, created = ToastOrder.objects.update_or_create(
-                    order_guid=order_guid,
-                    tenant_id=self.integration.organisation.id,
-                    defaults=order_defaults
-                )
+                # One transaction per order: its row, checks and selections
+                # commit together instead of each write committing on its own.
+                with transaction.atomic():
+                    order_update, created = ToastOrder.objects.update_or_create(
+                        order_guid=order_guid,
+                        tenant_id=self.integration.organisation.id,
+                        defaults=order_defaults
+                    )
 
-                if created:
-                   print(f"Created {process_count} order with GUID: {order_guid} and net sales: {net_sales} business date: {order_data.get('businessDate')}")
-                else:
-                    # print(order_update)
-                    print(f"Updated {process_count} order with GUID: {order_guid} and net sales: {net_sales} business date: {order_data.get('businessDate')}")
+                    if created:
+                       print(f"Created {process_count} order with GUID: {order_guid} and net sales: {net_sales} business date: {order_data.get('businessDate')}")
+                    else:
+                        # print(order_update)
+                        print(f"Updated {process_count} order with GUID: {order_guid} and net sales: {net_sales} business date: {order_data.get('businessDate')}")
 
 
-                self.process_checks_v2(order_data, order_update, restaurant_guid)
+                    self.process_checks_v2(order_data, order_update, restaurant_guid)
 
                 process_count += 1
             except Exception as e:
@@ -1332,6 +1365,7 @@ class ToastIntegrationService:
                 logger.error(f"Error processing order {order_guid}: {e}", exc_info=True)
                 continue
 
+        invalidate_sales_summary_cache()
 
 
 
@@ -1475,6 +1509,15 @@ class ToastIntegrationService:
 
                     selection_count = len(check_data.get("selections", []))
                     
+                    # One query for all selections already stored for this check.
+                    existing_selections = {
+                        selection.selection_guid: selection
+                        for selection in ToastSelection.objects.filter(
+                            tenant_id=self.integration.organisation.id,
+                            selection_guid__in=[s.get("guid") for s in check_data.get("selections", [])]
+                        )
+                    }
+
                     selection_index = 0
                     for selection_data in check_data.get("selections", []):
                         try:
@@ -1526,36 +1569,36 @@ class ToastIntegrationService:
                             }
                          
 
-                            try:
-                                selection_obj = ToastSelection.objects.get(
-                                    selection_guid=selection_guid,
-                                    tenant_id=self.integration.organisation.id
-                                )
-                                for key, value in selection_defaults.items():
-                                    setattr(selection_obj, key, value)
-                                selection_obj.order_guid = order_guid
-                                selection_obj.toast_check = check_obj 
-                                selection_obj.display_name = selection_data.get("displayName")
-                                selection_obj.pre_discount_price = pre_discount_price
-                                selection_obj.discount_total = selection_discount_total 
-                                selection_obj.net_sales = selection_net 
-                                selection_obj.quantity = quantity
-                                selection_obj.business_date = order_data["businessDate"]
-                                selection_obj.save()
-                            except ToastSelection.DoesNotExist:
-                                ToastSelection.objects.create(
-                                    selection_guid=selection_guid,
-                                    toast_check=check_obj,
-                                    tenant_id=self.integration.organisation.id,
-                                    order_guid=order_guid,
-                                    display_name=selection_data.get("displayName"),
-                                    pre_discount_price=pre_discount_price,
-                                    discount_total=selection_discount_total,
-                                    net_sales=selection_net,
-                                    quantity=quantity,
-                                    business_date=order_data["businessDate"],
-                                    **selection_defaults
-                                )
+                            # Savepoint, so a failed selection is skipped without
+                            # aborting the order's transaction.
+                            with transaction.atomic():
+                                selection_obj = existing_selections.get(selection_guid)
+                                if selection_obj is not None:
+                                    # selection_defaults only holds plain columns, so no descriptors are bypassed.
+                                    selection_obj.__dict__.update(selection_defaults)
+                                    selection_obj.order_guid = order_guid
+                                    selection_obj.toast_check = check_obj 
+                                    selection_obj.display_name = selection_data.get("displayName")
+                                    selection_obj.pre_discount_price = pre_discount_price
+                                    selection_obj.discount_total = selection_discount_total 
+                                    selection_obj.net_sales = selection_net 
+                                    selection_obj.quantity = quantity
+                                    selection_obj.business_date = order_data["businessDate"]
+                                    selection_obj.save()
+                                else:
+                                    existing_selections[selection_guid] = ToastSelection.objects.create(
+                                        selection_guid=selection_guid,
+                                        toast_check=check_obj,
+                                        tenant_id=self.integration.organisation.id,
+                                        order_guid=order_guid,
+                                        display_name=selection_data.get("displayName"),
+                                        pre_discount_price=pre_discount_price,
+                                        discount_total=selection_discount_total,
+                                        net_sales=selection_net,
+                                        quantity=quantity,
+                                        business_date=order_data["businessDate"],
+                                        **selection_defaults
+                                    )
                             
 
                         except Exception as e:
@@ -2,32 +2,70 @@ from django.db import transaction, close_old_connections
 import hashlib
 from core.models import Organisation
 
+# Upper bound on rows per INSERT statement. Keeps each statement a fixed,
+# repeatable shape instead of one huge INSERT per transaction batch.
+BULK_INSERT_BATCH_SIZE = 1000
+
+# Number of committed batches between close_old_connections() checks.
+CLOSE_CONNECTIONS_EVERY = 20
+
+
 class BatchUtils:
     @staticmethod
     def bulk_create_batches(model, objects, batch_size=10000):
         """
         Accepts a model and an iterable of objects.
         Creates the objects in batches (each in its own atomic block)
-        and calls close_old_connections() after each batch.
+        and calls close_old_connections() every CLOSE_CONNECTIONS_EVERY
+        batches and once at the end.
+        Each INSERT is capped at BULK_INSERT_BATCH_SIZE rows.
         Returns the total number of objects created.
         """
         total_count = 0
+        batches_since_close = 0
         batch = []
         for obj in objects:
             batch.append(obj)
             if len(batch) >= batch_size:
                 with transaction.atomic():
-                    model.objects.bulk_create(batch, batch_size=batch_size)
+                    model.objects.bulk_create(batch, batch_size=min(batch_size, BULK_INSERT_BATCH_SIZE))
                 total_count += len(batch)
                 batch.clear()
-                close_old_connections()
+                batches_since_close += 1
+                if batches_since_close >= CLOSE_CONNECTIONS_EVERY:
+                    close_old_connections()
+                    batches_since_close = 0
         if batch:
             with transaction.atomic():
-                model.objects.bulk_create(batch, batch_size=batch_size)
+                model.objects.bulk_create(batch, batch_size=min(batch_size, BULK_INSERT_BATCH_SIZE))
             total_count += len(batch)
-            close_old_connections()
+        close_old_connections()
         return total_count
 
+    @staticmethod
+    def bulk_upsert(model, objects, unique_fields, update_fields, batch_size=BULK_INSERT_BATCH_SIZE):
+        """
+        Writes objects with INSERT ... ON CONFLICT DO UPDATE, one atomic block per batch.
+        Objects sharing a unique key are collapsed to the last one seen, since
+        Postgres rejects a statement that updates the same row twice.
+        Returns the number of rows written.
+        """
+        key_attnames = [model._meta.get_field(name).attname for name in unique_fields]
+        rows = {}
+        for obj in objects:
+            rows[tuple(getattr(obj, attname) for attname in key_attnames)] = obj
+        rows = list(rows.values())
+        for start in range(0, len(rows), batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(
+                    rows[start:start + batch_size],
+                    update_conflicts=True,
+                    unique_fields=unique_fields,
+                    update_fields=update_fields,
+                    batch_size=min(batch_size, BULK_INSERT_BATCH_SIZE),
+                )
+        return len(rows)
+
     @staticmethod
     def process_in_batches(items, process_func, batch_size=10000):
         """
@@ -1,11 +1,20 @@
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 import logging
+import threading
 import time  # Used for sleep on retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from datetime import timedelta, datetime, date
 from zoneinfo import ZoneInfo
+from django.core.cache import cache
+from django.db import connections, transaction
 from django.utils import timezone
-from django.db import transaction
+from django.db.models import Max, Min
+from django.db.models.fields.json import KT
 from integrations.services.utils import BatchUtils
 from integrations.models.models import (
     Integration, 
@@ -31,28 +40,188 @@ from core.models import Site, IntegrationSiteMapping
 
 logger = logging.getLogger(__name__)
 
+UTC = ZoneInfo("UTC")
+XERO_DATE_RE = re.compile(r'/Date\((-?\d+)([+-]\d{4})?\)/')
+
+XERO_TOKEN_URL = "https://identity.xero.com/connect/token"
+
+# Scopes requested for client-credentials tokens.
+XERO_TOKEN_SCOPES = (
+    "accounting.transactions accounting.settings accounting.reports.read "
+    "accounting.journals.read accounting.budgets.read accounting.contacts"
+)
+
+# (connect, read) timeout in seconds for every Xero request.
+XERO_REQUEST_TIMEOUT = (5, 60)
+
+# Largest page size accepted by Xero's paginated accounting endpoints.
+XERO_PAGE_SIZE = 1000
+
+# Xero allows at most 5 concurrent calls per tenant connection.
+XERO_MAX_CONCURRENT_REQUESTS = 5
+
+# Xero allows 60 calls per minute per tenant.
+XERO_MAX_REQUESTS_PER_MINUTE = 60
+
+# How many times a 429 is waited out before the call gives up, and the longest
+# Retry-After honoured each time. Longer waits are left to the Celery retry.
+XERO_RATE_LIMIT_RETRIES = 3
+XERO_MAX_RETRY_AFTER = 60
+
+# Remaining daily calls (of Xero's 5000 per tenant) below which each call logs a warning.
+XERO_DAY_LIMIT_WARNING = 250
+
+# How long a page's ETag is kept. Once it expires the page is fetched and
+# processed in full again, so a lost import is eventually repaired.
+XERO_ETAG_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Journal lines buffered across pages before they are written. Xero returns
+# 100 journals per page, so flushing per page would mean many small statements.
+JOURNAL_LINE_FLUSH_SIZE = 5000
+
+# Columns refreshed when a journal line is re-imported.
+JOURNAL_LINE_UPDATE_FIELDS = [
+    "tenant_id", "journal_id", "reference", "source_id", "journal_number", "source_type",
+    "account_id", "account_code", "account_type", "account_name", "description",
+    "net_amount", "gross_amount", "tax_amount", "journal_date", "created_date_utc",
+    "ingestion_timestamp", "source_system", "tracking_category_name", "tracking_category_option",
+]
+
+# Columns refreshed when a budget period balance is re-imported.
+BUDGET_PERIOD_BALANCE_UPDATE_FIELDS = [
+    "tenant_name", "account_code", "account_name", "reporting_code", "reporting_code_name",
+    "amount", "notes", "updated_date_utc", "ingestion_timestamp", "source_system",
+    "tracking_category_id", "tracking_category_name", "tracking_category_option",
+]
+
+# Columns refreshed when an invoice line item is re-imported.
+INVOICE_LINE_ITEM_UPDATE_FIELDS = [
+    "invoice_id", "contact_id", "contact_name", "reference", "date", "due_date",
+    "updated_date_utc", "fully_paid_on_date", "invoice_number", "tax_amount", "line_amount",
+    "url", "type", "tenant_id", "description", "quantity", "unit_amount", "account_code",
+]
+
+# Columns refreshed from a bank transaction's line items; invoice fields are left alone.
+BANK_TRANSACTION_LINE_ITEM_UPDATE_FIELDS = [
+    "tenant_id", "description", "quantity", "unit_amount", "account_code", "tax_type",
+    "tax_amount", "line_amount",
+]
+
+# Tracking category names that represent a physical site/location.
+SITE_TRACKING_CATEGORY_NAMES = frozenset(("location", "branch", "site", "store"))
+
+# Access tokens by integration id, shared by every importer in the process so
+# consecutive tasks for the same integration don't look the token up again.
+_TOKEN_CACHE = {}
+_TOKEN_CACHE_LOCK = threading.Lock()
+
 # -------------------------------------------------------------------
 # NEW HELPER FUNCTION
 # -------------------------------------------------------------------
-def request_with_retry(method: str, url: str, **kwargs) -> requests.Response:
+def build_xero_session() -> requests.Session:
+    """
+    Returns a Session with a pooled HTTPS adapter so consecutive Xero
+    calls reuse the same keep-alive connection instead of a new TLS handshake.
+    The adapter retries 5xx responses a few times with a short, capped backoff;
+    429s are left to XeroDataImporter.request, which waits them out without
+    holding a concurrency slot.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=1,
+            backoff_max=10,
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=frozenset(["GET", "POST"]),
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.headers.update({"Accept": "application/json"})
+    return session
+
+
+class XeroRetryableError(requests.exceptions.HTTPError):
+    """A 429 or 5xx response from Xero; the call may succeed if repeated later."""
+
+
+def request_with_retry(method: str, url: str, session: requests.Session = None, **kwargs) -> requests.Response:
     """
     Performs an HTTP request with the given method and parameters.
-    If a 429 (Too Many Requests) error is received, waits for 30 seconds and retries.
-    This function can be used for all API calls.
+    Pass a session from build_xero_session(): its adapter retries 5xx
+    responses with a capped exponential backoff.
+    Raises XeroRetryableError for a 429 or 5xx that outlasted those retries,
+    and a plain HTTPError for anything else, including a 429 for the daily
+    limit, which no retry today will get past.
     """
-    while True:
-        response = requests.request(method, url, **kwargs)
-        try:
-            response.raise_for_status()
-            return response
-        except requests.HTTPError as e:
-            if response.status_code == 429:
-                logger.warning(
-                    "429 Too Many Requests for url %s. Waiting 30 seconds before retrying.", url
-                )
-                time.sleep(30)
-            else:
-                raise
+    requester = session or requests
+    kwargs.setdefault("timeout", XERO_REQUEST_TIMEOUT)
+    response = requester.request(method, url, **kwargs)
+    if response.status_code == 429 and response.headers.get("X-Rate-Limit-Problem", "").lower() == "day":
+        logger.error("Xero daily rate limit reached for url %s.", url)
+        response.raise_for_status()
+    if response.status_code == 429 or response.status_code >= 500:
+        raise XeroRetryableError(f"{response.status_code} from Xero for url {url}", response=response)
+    response.raise_for_status()
+    return response
+
+
+class XeroRateLimiter:
+    """
+    Token bucket pacing calls to XERO_MAX_REQUESTS_PER_MINUTE. The bucket holds
+    at most XERO_MAX_CONCURRENT_REQUESTS tokens, so a burst never outruns the
+    per-minute limit by more than the concurrency cap.
+    """
+
+    def __init__(self, rate_per_minute=XERO_MAX_REQUESTS_PER_MINUTE, capacity=XERO_MAX_CONCURRENT_REQUESTS):
+        self.interval = 60.0 / rate_per_minute
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a call may be made."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) / self.interval)
+            self.updated_at = now
+            self.tokens -= 1
+            wait = -self.tokens * self.interval if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+    def drain(self, pause=60):
+        """Empties the bucket so no further call is let through for pause seconds."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.tokens + (now - self.updated_at) / self.interval, -pause / self.interval)
+            self.updated_at = now
+
+
+@lru_cache(maxsize=4096)
+def parse_xero_datetime(xero_date_str: str):
+    """
+    Parses a Xero '/Date(ms+zzzz)/' or ISO 8601 timestamp into an aware datetime.
+    Cached, since the same dates repeat across the lines of a journal or invoice.
+    """
+    match = XERO_DATE_RE.match(xero_date_str)
+    if match:
+        # The millisecond value is already UTC; the offset only describes the org's zone.
+        timestamp_ms = match.group(1)
+        return datetime.fromtimestamp(int(timestamp_ms) / 1000.0, tz=UTC)
+
+    if xero_date_str.endswith("Z"):
+        xero_date_str = xero_date_str[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(xero_date_str)
+    except ValueError:
+        logger.warning(f"Unknown date format: {xero_date_str}")
+        return None
 
 
 class XeroDataImporter:
@@ -72,38 +241,163 @@ class XeroDataImporter:
         
         # Update to use 'organisation' instead of 'org'
         self.tenant_id = str(integration.organisation.id)
+
+        # A pooled session per thread (requests.Session isn't thread-safe), and
+        # a shared cap on concurrent calls across all of those threads.
+        self._thread_local = threading.local()
+        self._request_slots = threading.BoundedSemaphore(XERO_MAX_CONCURRENT_REQUESTS)
+        self._rate_limiter = XeroRateLimiter()
         
         if since_date is None:
             self.since_date = timezone.now().date()
         if until_date is None:
             self.until_date = timezone.now().date()
+
+        # Headers that don't depend on the token are fixed for the importer's lifetime.
+        self._static_headers = self.build_static_headers()
+        self._headers = None
+        self._headers_token = None
         
-    def get_paginated_results(self, url: str, result_key: str, extra_params: dict = None) -> list:
-        results = []
-        page = 1
-        params = extra_params.copy() if extra_params else {}
-        logger = logging.getLogger(__name__)
+    @property
+    def session(self) -> requests.Session:
+        """The calling thread's pooled Xero session, created on first use."""
+        session = getattr(self._thread_local, "session", None)
+        if session is None:
+            session = self._thread_local.session = build_xero_session()
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Performs a Xero API call through the shared session, within the concurrency and rate caps."""
+        for attempt in range(XERO_RATE_LIMIT_RETRIES + 1):
+            self._rate_limiter.acquire()
+            try:
+                with self._request_slots:
+                    response = request_with_retry(method, url, session=self.session, **kwargs)
+                break
+            except XeroRetryableError as e:
+                if e.response.status_code != 429 or attempt == XERO_RATE_LIMIT_RETRIES:
+                    raise
+                retry_after = e.response.headers.get("Retry-After", "")
+                wait = min(int(retry_after) if retry_after.isdigit() else XERO_MAX_RETRY_AFTER, XERO_MAX_RETRY_AFTER)
+                logger.warning("Xero rate limited url %s; retrying in %s seconds.", url, wait)
+                self._rate_limiter.drain(wait)
+
+        # Pausing goes through the rate limiter, so no concurrency slot is held while waiting.
+        if response.headers.get("X-MinLimit-Remaining") in ("0", "1"):
+            logger.warning("Xero minute rate limit nearly exhausted for url %s. Pausing 60 seconds.", url)
+            self._rate_limiter.drain(60)
+        day_remaining = response.headers.get("X-DayLimit-Remaining")
+        if day_remaining and day_remaining.isdigit() and int(day_remaining) <= XERO_DAY_LIMIT_WARNING:
+            logger.warning("Only %s Xero calls left today for tenant %s.", day_remaining, self.tenant_id)
+        return response
+
+    def etag_key(self, url: str, page) -> str:
+        """Cache key for the ETag of one page of a Xero endpoint."""
+        return f"xero:{self.tenant_id}:{url.rsplit('/', 1)[-1]}:{page or 1}"
+
+    def get_if_changed(self, url: str, params: dict = None, page: int = None, headers: dict = None,
+                       pending_etags: dict = None):
+        """
+        GETs url, sending the last ETag seen for it as If-None-Match.
+        Returns the decoded payload, or None when Xero answers 304 Not Modified.
+        ETags are only used when pending_etags is given; the new ETag is put there
+        rather than cached, and the caller saves it with save_etags() once the
+        page's rows are written.
+        """
+        etag_key = self.etag_key(url, page)
+        headers = dict(headers or self.build_headers())
+        if pending_etags is not None:
+            etag = cache.get(etag_key)
+            if etag:
+                headers["If-None-Match"] = etag
+
+        response = self.request("get", url, headers=headers, params=params)
+        if response.status_code == 304:
+            logger.info("Page %s of %s not modified; skipping.", page or 1, url)
+            return None
+        if pending_etags is not None and response.headers.get("ETag"):
+            pending_etags[etag_key] = response.headers["ETag"]
+        return orjson.loads(response.content)
+
+    @staticmethod
+    def save_etags(pending_etags: dict):
+        """Caches the ETags collected by get_if_changed once the current transaction commits."""
+        if pending_etags:
+            etags = dict(pending_etags)
+            transaction.on_commit(lambda: cache.set_many(etags, XERO_ETAG_CACHE_TTL))
+
+    def fetch_page(self, url: str, params: dict, page: int, headers: dict = None, pending_etags: dict = None):
+        """
+        Fetches a single page and returns the decoded payload, or None if it
+        has not changed since it was last fetched.
+        """
+        return self.get_if_changed(
+            url, params={**params, "page": page}, page=page, headers=headers, pending_etags=pending_etags
+        )
 
-        while True:
-            params.update({"page": page})
+    def get_paginated_results(self, url: str, result_key: str, extra_params: dict = None,
+                              pending_etags: dict = None) -> list:
+        params = extra_params.copy() if extra_params else {}
+        params.setdefault("pageSize", XERO_PAGE_SIZE)
+        page_size = params["pageSize"]
+
+        # Pages Xero reports as not modified contribute no records; walking
+        # on past them still picks up pages that did change.
+        payload = self.fetch_page(url, params, 1, pending_etags=pending_etags)
+        if payload is None:
+            payload = {}
+            results = []
+        else:
+            results = payload.get(result_key, [])
+            logger.info("Fetched %d records on page 1", len(results))
+            if len(results) < page_size:
+                return results
+
+        # The last page reached is kept with the ETags, so a later run whose
+        # first page is unchanged still knows how far to walk.
+        last_page_key = self.etag_key(url, "last_page")
+
+        # Endpoints that report a page count can have the remaining pages
+        # fetched concurrently, within Xero's concurrent request limit.
+        page_count = (payload.get("pagination") or {}).get("pageCount")
+        if page_count:
             headers = self.build_headers()
-            response = requests.get(url, headers=headers, params=params)
-            # Handle rate limit (HTTP 429)
-            if response.status_code == 429:
-                retry_after = int(response.headers.get("Retry-After", 60))
-                logger.warning(f"Rate limit hit on page {page}. Retrying after {retry_after} seconds.")
-                time.sleep(retry_after)
+            with ThreadPoolExecutor(max_workers=XERO_MAX_CONCURRENT_REQUESTS) as executor:
+                pages = executor.map(
+                    lambda page: (
+                        self.fetch_page(url, params, page, headers, pending_etags) or {}
+                    ).get(result_key, []),
+                    range(2, page_count + 1),
+                )
+                for page, page_results in enumerate(pages, start=2):
+                    logger.info("Fetched %d records on page %d", len(page_results), page)
+                    results.extend(page_results)
+            if pending_etags is not None:
+                pending_etags[last_page_key] = page_count
+            return results
+
+        # Without a page count, unchanged pages are only walked past up to the
+        # last page reached on the previous run; past it, or with no record of
+        # it, a 304 ends the walk.
+        last_page = cache.get(last_page_key) if pending_etags is not None else None
+        page = 2
+        while True:
+            payload = self.fetch_page(url, params, page, pending_etags=pending_etags)
+            if payload is None:
+                if last_page is None or page >= last_page:
+                    break
+                page += 1
                 continue
-
-            response.raise_for_status()
-            page_results = response.json().get(result_key, [])
-            logger.info(f"Fetched {len(page_results)} records on page {page}")
+            page_results = payload.get(result_key, [])
+            logger.info("Fetched %d records on page %d", len(page_results), page)
             if not page_results:
                 break
             results.extend(page_results)
-            if len(page_results) < 100:
+            if len(page_results) < page_size:
                 break
             page += 1
+        if pending_etags is not None:
+            pending_etags[last_page_key] = page
         return results
 
 
@@ -111,20 +405,15 @@ class XeroDataImporter:
         if not self.client_id or not self.client_secret:
             raise ValueError("Xero client credentials not set on this Integration.")
 
-        token_url = "https://identity.xero.com/connect/token"
         auth = (self.client_id, self.client_secret)
-        scopes = (
-            "accounting.transactions accounting.settings accounting.reports.read "
-            "accounting.journals.read accounting.budgets.read accounting.contacts"
-        )
         data = {
             "grant_type": "client_credentials",
-            "scope": scopes,
+            "scope": XERO_TOKEN_SCOPES,
         }
 
         # Use our helper function to perform the POST request.
-        response = request_with_retry("post", token_url, data=data, auth=auth)
-        token_data = response.json()
+        response = self.request("post", XERO_TOKEN_URL, data=data, auth=auth)
+        token_data = orjson.loads(response.content)
         access_token = token_data["access_token"]
         expires_in = token_data.get("expires_in", 1800)
         expires_at = timezone.now() + timedelta(seconds=expires_in)
@@ -137,48 +426,70 @@ class XeroDataImporter:
                 "expires_at": expires_at
             }
         )
+        self.cache_token(access_token, expires_at)
         return access_token
 
+    def cache_token(self, token: str, expires_at):
+        """
+        Keeps the token in this process and in the shared Django cache, so
+        other workers can use it without a database lookup.
+        """
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE[self.integration.id] = (token, expires_at)
+        ttl = int((expires_at - timezone.now()).total_seconds()) - 60
+        if ttl > 0:
+            cache.set(f"xero:token:{self.integration.id}", (token, expires_at), ttl)
+
     def get_valid_xero_token(self) -> str:
         now = timezone.now()
-        token_obj = (
+        with _TOKEN_CACHE_LOCK:
+            cached = _TOKEN_CACHE.get(self.integration.id)
+        if cached and cached[1] > now + timedelta(minutes=1):
+            return cached[0]
+
+        shared = cache.get(f"xero:token:{self.integration.id}")
+        if shared and shared[1] > now + timedelta(minutes=1):
+            with _TOKEN_CACHE_LOCK:
+                _TOKEN_CACHE[self.integration.id] = shared
+            return shared[0]
+
+        stored = (
             IntegrationAccessToken.objects.filter(
                 integration=self.integration,
                 integration_type="XERO",
                 expires_at__gt=now + timedelta(minutes=1)
             )
             .order_by("-created_at")
+            .values_list("token", "expires_at")
             .first()
         )
-        if token_obj:
-            return token_obj.token
+        if stored:
+            self.cache_token(*stored)
+            return stored[0]
 
         return self.request_new_xero_token()
 
     def parse_xero_datetime(self, xero_date_str: str):
         if not xero_date_str:
             return None
-
-        match = re.match(r'/Date\((\d+)([+-]\d{4})\)/', xero_date_str)
-        if match:
-            timestamp_ms, offset_str = match.groups()
-            timestamp = int(timestamp_ms) / 1000.0
-            dt = datetime.fromtimestamp(timestamp, tz=ZoneInfo("UTC"))
-            return dt
-
-        try:
-            return datetime.fromisoformat(xero_date_str.replace("Z", "+00:00"))
-        except ValueError:
-            logger.warning(f"Unknown date format: {xero_date_str}")
-            return None
+        return parse_xero_datetime(xero_date_str)
 
     def build_headers(self, offset=None) -> dict:
+        """
+        Returns the request headers. They only change when the token does,
+        so the dict is built once per token and reused.
+        """
         token = self.get_valid_xero_token()
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/json"
-        }
-        
+        if offset is not None:
+            logger.debug("build_headers called with offset: %s", offset)
+        if token != self._headers_token:
+            self._headers = {"Authorization": f"Bearer {token}", **self._static_headers}
+            self._headers_token = token
+        return self._headers
+
+    def build_static_headers(self) -> dict:
+        headers = {"Accept": "application/json"}
+
         # If since_date is provided, convert it to a datetime object if needed.
         if self.since_date:
             date_obj = None
@@ -193,8 +504,6 @@ class XeroDataImporter:
             
             if date_obj:
                 headers["If-Modified-Since"] = date_obj.strftime("%a, %d %b %Y %H:%M:%S GMT")
-        if offset is not None:
-            logger.debug(f"build_headers called with offset: {offset}")
         return headers
 
     def log_import_event(self, module_name: str, fetched_records: int):
@@ -209,38 +518,45 @@ class XeroDataImporter:
 
     def sync_xero_chart_of_accounts(self):
         logger.info("Syncing Xero Chart of Accounts...")
-        headers = self.build_headers()
         url = "https://api.xero.com/api.xro/2.0/Accounts"
 
-        # Use our retry helper instead of a direct requests.get call.
-        response = request_with_retry("get", url, headers=headers)
-        accounts_data = response.json().get("Accounts", [])
+        pending_etags = {}
+        payload = self.get_if_changed(url, pending_etags=pending_etags)
+        if payload is None:
+            logger.info("Xero Chart of Accounts unchanged; nothing to import.")
+            return
+        accounts_data = payload.get("Accounts", [])
         now_ts = timezone.now()
+        tenant_id = self.integration.organisation.id
 
-        def process_account(acct):
+        account_rows = []
+        for acct in accounts_data:
             account_id = acct.get("AccountID")
             if not account_id:
                 logger.warning("Account entry missing 'AccountID'. Skipping record.")
-                return
+                continue
             try:
-                obj, created = XeroAccountsRaw.objects.update_or_create(
-                    tenant_id=self.integration.organisation.id,
+                account_rows.append(XeroAccountsRaw(
+                    tenant_id=tenant_id,
                     account_id=account_id,
-                    defaults={
-                        "name": acct.get("Name"),
-                        "status": acct.get("Status"),
-                        "type": acct.get("Type"),
-                        "updated_date_utc": self.parse_xero_datetime(acct.get("UpdatedDateUTC")),
-                        "raw_payload": acct,
-                        "ingestion_timestamp": now_ts,
-                        "source_system": "XERO",
-                    }
-                )
-                obj.save()
+                    name=acct.get("Name"),
+                    status=acct.get("Status"),
+                    type=acct.get("Type"),
+                    updated_date_utc=self.parse_xero_datetime(acct.get("UpdatedDateUTC")),
+                    raw_payload=acct,
+                    ingestion_timestamp=now_ts,
+                    source_system="XERO",
+                ))
             except Exception as e:
-                logger.error(f"Error saving XeroAccountsRaw for AccountID {account_id}: {e}")
+                logger.error(f"Error preparing XeroAccountsRaw for AccountID {account_id}: {e}")
 
-        BatchUtils.process_in_batches(accounts_data, process_account, batch_size=1000)
+        BatchUtils.bulk_upsert(
+            XeroAccountsRaw, account_rows,
+            unique_fields=["tenant_id", "account_id"],
+            update_fields=["name", "status", "type", "updated_date_utc", "raw_payload",
+                           "ingestion_timestamp", "source_system"],
+        )
+        self.save_etags(pending_etags)
         self.log_import_event(module_name="xero_accounts", fetched_records=len(accounts_data))
         logger.info(f"Imported/Updated {len(accounts_data)} Xero Accounts.")
 
@@ -252,277 +568,353 @@ class XeroDataImporter:
             params["offset"] = offset
 
         # Use our retry helper for GET
-        response = request_with_retry("get", url, headers=headers, params=params)
-        journals = response.json().get("Journals", [])
+        response = self.request("get", url, headers=headers, params=params)
+        journals = orjson.loads(response.content).get("Journals", [])
         return journals
 
     def import_xero_journal_lines(self):
         logger.info("Importing Xero Journals & Lines with pagination...")
         offset = None
         total_fetched = 0
+        tenant_id = self.integration.organisation.id
+        journal_rows = []
+        line_rows = []
+        tracking_rows = []
+
+        def flush():
+            BatchUtils.bulk_upsert(
+                XeroJournalsRaw, journal_rows,
+                unique_fields=["tenant_id", "journal_id"],
+                update_fields=["journal_number", "reference", "journal_date", "created_date_utc",
+                               "raw_payload", "ingestion_timestamp", "source_system"],
+            )
+            BatchUtils.bulk_upsert(
+                XeroJournalLines, line_rows,
+                unique_fields=["journal_line_id"],
+                update_fields=JOURNAL_LINE_UPDATE_FIELDS,
+            )
+            BatchUtils.bulk_upsert(
+                XeroJournalLineTrackingCategories, tracking_rows,
+                unique_fields=["tenant_id", "journal_line_id", "tracking_category_id"],
+                update_fields=["line_item_id", "tracking_option_id", "name", "option",
+                               "ingestion_timestamp", "source_system"],
+            )
+            journal_rows.clear()
+            line_rows.clear()
+            tracking_rows.clear()
 
-        while True:
-            journals = self.get_journals(offset=offset)
-            total_fetched += len(journals)
-            logger.info(f"Fetched {len(journals)} journals")
-            if not journals:
-                break
-
-            now_ts = timezone.now()
-
-            def process_journal(journal):
-                logger.debug(f"Processing journal: {journal}")
-                journal_id = journal.get("JournalID")
-                if not journal_id:
-                    logger.warning("Skipping journal with no JournalID.")
-                    return
-                jr_defaults = {
-                    "journal_number": journal.get("JournalNumber"),
-                    "reference": journal.get("Reference"),
-                    "journal_date": self.parse_xero_datetime(journal.get("JournalDate")),
-                    "created_date_utc": self.parse_xero_datetime(journal.get("CreatedDateUTC")),
-                    "raw_payload": journal,
-                    "ingestion_timestamp": now_ts,
-                    "source_system": "XERO"
-                }
-                XeroJournalsRaw.objects.update_or_create(
-                    tenant_id=self.integration.organisation.id,
-                    journal_id=journal_id,
-                    defaults=jr_defaults
-                )
-                for line in journal.get("JournalLines", []):
-                    line_id = line.get("JournalLineID")
-                    if not line_id:
-                        logger.warning(f"Skipping line in Journal {journal_id} with no JournalLineID.")
-                        continue
-                    # Process tracking categories from the journal line.
-                    tcat = line.get("TrackingCategories", [])
-                    # Use the first tracking category (if any) for default fields.
-                    tracking_name = tcat[0].get("Name") if tcat else None
-                    tracking_option = tcat[0].get("Option") if tcat else None
-
-                    jline_defaults = {
-                        "tenant_id": self.integration.organisation.id,
-                        "journal_id": journal_id,
-                        "reference": journal.get("Reference"),
-                        "source_id": journal.get("SourceID"),
-                        "journal_number": journal.get("JournalNumber"),
-                        "source_type": journal.get("SourceType"),
-                        "account_id": line.get("AccountID"),
-                        "account_code": line.get("AccountCode"),
-                        "account_type": line.get("AccountType"),
-                        "account_name": line.get("AccountName"),
-                        "description": line.get("Description"),
-                        "net_amount": line.get("NetAmount"),
-                        "gross_amount": line.get("GrossAmount"),
-                        "tax_amount": line.get("TaxAmount"),
-                        "journal_date": self.parse_xero_datetime(journal.get("JournalDate")),
-                        "created_date_utc": self.parse_xero_datetime(journal.get("CreatedDateUTC")),
-                        "ingestion_timestamp": now_ts,
-                        "source_system": "XERO",
-                        "tracking_category_name": tracking_name,
-                        "tracking_category_option": tracking_option,
-                    }
-                    XeroJournalLines.objects.update_or_create(
-                        journal_line_id=line_id,
-                        defaults=jline_defaults
-                    )
-                    # Now, process each tracking category from the journal line.
-                    if tcat:
+        prefetch = ThreadPoolExecutor(max_workers=1)
+        next_page = prefetch.submit(self._run_in_thread, partial(self.get_journals, offset=offset))
+        try:
+            while True:
+                journals = next_page.result()
+                total_fetched += len(journals)
+                logger.info("Fetched %d journals", len(journals))
+                if not journals:
+                    break
+
+                # The next offset is the last JournalNumber on this page, so the
+                # next page can be fetched while this one is being written.
+                last_page = len(journals) < 100
+                if not last_page:
+                    offset = journals[-1].get("JournalNumber")
+                    logger.info("Pagination: next offset: %s", offset)
+                    next_page = prefetch.submit(self._run_in_thread, partial(self.get_journals, offset=offset))
+
+                now_ts = timezone.now()
+
+                def process_journal(journal):
+                    logger.debug("Processing journal: %s", journal.get("JournalID"))
+                    journal_id = journal.get("JournalID")
+                    if not journal_id:
+                        logger.warning("Skipping journal with no JournalID.")
+                        return
+                    journal_date = self.parse_xero_datetime(journal.get("JournalDate"))
+                    created_date_utc = self.parse_xero_datetime(journal.get("CreatedDateUTC"))
+                    journal_rows.append(XeroJournalsRaw(
+                        tenant_id=tenant_id,
+                        journal_id=journal_id,
+                        journal_number=journal.get("JournalNumber"),
+                        reference=journal.get("Reference"),
+                        journal_date=journal_date,
+                        created_date_utc=created_date_utc,
+                        raw_payload=journal,
+                        ingestion_timestamp=now_ts,
+                        source_system="XERO",
+                    ))
+                    for line in journal.get("JournalLines", []):
+                        line_id = line.get("JournalLineID")
+                        if not line_id:
+                            logger.warning("Skipping line in Journal %s with no JournalLineID.", journal_id)
+                            continue
+                        # Process tracking categories from the journal line.
+                        tcat = line.get("TrackingCategories") or []
+                        # Use the first tracking category (if any) for default fields.
+                        first_tracking = tcat[0] if tcat else {}
+                        tracking_name = first_tracking.get("Name")
+                        tracking_option = first_tracking.get("Option")
+
+                        line_rows.append(XeroJournalLines(
+                            journal_line_id=line_id,
+                            tenant_id=tenant_id,
+                            journal_id=journal_id,
+                            reference=journal.get("Reference"),
+                            source_id=journal.get("SourceID"),
+                            journal_number=journal.get("JournalNumber"),
+                            source_type=journal.get("SourceType"),
+                            account_id=line.get("AccountID"),
+                            account_code=line.get("AccountCode"),
+                            account_type=line.get("AccountType"),
+                            account_name=line.get("AccountName"),
+                            description=line.get("Description"),
+                            net_amount=line.get("NetAmount"),
+                            gross_amount=line.get("GrossAmount"),
+                            tax_amount=line.get("TaxAmount"),
+                            journal_date=journal_date,
+                            created_date_utc=created_date_utc,
+                            ingestion_timestamp=now_ts,
+                            source_system="XERO",
+                            tracking_category_name=tracking_name,
+                            tracking_category_option=tracking_option,
+                        ))
+                        # Now, process each tracking category from the journal line.
                         for tracking in tcat:
-                            XeroJournalLineTrackingCategories.objects.update_or_create(
-                                tenant_id=self.integration.organisation.id,
+                            tracking_rows.append(XeroJournalLineTrackingCategories(
+                                tenant_id=tenant_id,
                                 journal_line_id=line_id,
                                 tracking_category_id=tracking.get("TrackingCategoryID"),
-                                defaults={
-                                    # Optionally, set line_item_id as the same as line_id.
-                                    "line_item_id": line_id,
-                                    "tracking_option_id": tracking.get("TrackingOptionID"),
-                                    "name": tracking.get("Name"),
-                                    "option": tracking.get("Option"),
-                                    "ingestion_timestamp": now_ts,
-                                    "source_system": "XERO",
-                                }
-                            )
-
-            BatchUtils.process_in_batches(journals, process_journal, batch_size=1000)
-            if len(journals) < 100:
-                break
-            offset = journals[-1].get("JournalNumber")
-            logger.info(f"Pagination: next offset: {offset}")
-
+                                # Optionally, set line_item_id as the same as line_id.
+                                line_item_id=line_id,
+                                tracking_option_id=tracking.get("TrackingOptionID"),
+                                name=tracking.get("Name"),
+                                option=tracking.get("Option"),
+                                ingestion_timestamp=now_ts,
+                                source_system="XERO",
+                            ))
+
+                BatchUtils.process_in_batches(journals, process_journal, batch_size=1000)
+                if len(line_rows) >= JOURNAL_LINE_FLUSH_SIZE:
+                    flush()
+                if last_page:
+                    break
+        finally:
+            prefetch.shutdown(wait=True)
+
+        flush()
         self.log_import_event(module_name="xero_journal_lines", fetched_records=total_fetched)
         logger.info("Completed Xero Journal import & transform with pagination.")
 
 
-    def get_contacts(self):
-        return self.get_paginated_results("https://api.xero.com/api.xro/2.0/Contacts", "Contacts")
+    def get_contacts(self, pending_etags: dict = None):
+        return self.get_paginated_results(
+            "https://api.xero.com/api.xro/2.0/Contacts", "Contacts", pending_etags=pending_etags
+        )
 
 
     def import_xero_contacts(self):
         logger.info("Importing Xero Contacts...")
         now_ts = timezone.now()
-        contacts = self.get_contacts()
+        tenant_id = self.integration.organisation.id
+        pending_etags = {}
+        contacts = self.get_contacts(pending_etags)
 
-        def process_contact(contact):
+        contact_rows = []
+        for contact in contacts:
             contact_id = contact.get("ContactID")
             if not contact_id:
                 logger.warning("Skipping contact with no ContactID.")
-                return
-            XeroContactsRaw.objects.update_or_create(
-                tenant_id=self.integration.organisation.id,
+                continue
+            contact_rows.append(XeroContactsRaw(
+                tenant_id=tenant_id,
                 contact_id=contact_id,
-                defaults={
-                    "name": contact.get("Name"),
-                    "updated_date_utc": self.parse_xero_datetime(contact.get("UpdatedDateUTC")),
-                    "raw_payload": contact,
-                    "ingestion_timestamp": now_ts,
-                    "source_system": "XERO"
-                }
-            )
-
-        BatchUtils.process_in_batches(contacts, process_contact, batch_size=1000)
+                name=contact.get("Name"),
+                updated_date_utc=self.parse_xero_datetime(contact.get("UpdatedDateUTC")),
+                raw_payload=contact,
+                ingestion_timestamp=now_ts,
+                source_system="XERO",
+            ))
+
+        BatchUtils.bulk_upsert(
+            XeroContactsRaw, contact_rows,
+            unique_fields=["tenant_id", "contact_id"],
+            update_fields=["name", "updated_date_utc", "raw_payload", "ingestion_timestamp", "source_system"],
+        )
+        self.save_etags(pending_etags)
         self.log_import_event(module_name="xero_contacts", fetched_records=len(contacts))
         logger.info("Completed Xero Contacts import.")
 
 
-    def get_invoices(self):
-        return self.get_paginated_results("https://api.xero.com/api.xro/2.0/Invoices", "Invoices")
+    def get_invoices(self, pending_etags: dict = None):
+        return self.get_paginated_results(
+            "https://api.xero.com/api.xro/2.0/Invoices", "Invoices", pending_etags=pending_etags
+        )
 
 
     def import_xero_invoices(self):
         logger.info("Importing Xero Invoices...")
-        invoices = self.get_invoices()
+        pending_etags = {}
+        invoices = self.get_invoices(pending_etags)
         now_ts = timezone.now()
+        tenant_id = self.integration.organisation.id
+        invoice_rows = []
+        line_item_rows = []
 
         def process_invoice(inv):
             invoice_id = inv.get("InvoiceID")
             if not invoice_id:
                 logger.warning("Skipping invoice with no InvoiceID.")
                 return
-            XeroInvoicesRaw.objects.update_or_create(
-                tenant_id=self.integration.organisation.id,
+            invoice_date = self.parse_xero_datetime(inv.get("Date"))
+            due_date = self.parse_xero_datetime(inv.get("DueDate"))
+            updated_date_utc = self.parse_xero_datetime(inv.get("UpdatedDateUTC"))
+            fully_paid_on_date = self.parse_xero_datetime(inv.get("FullyPaidOnDate"))
+            invoice_rows.append(XeroInvoicesRaw(
+                tenant_id=tenant_id,
                 invoice_id=invoice_id,
-                defaults={
-                    "invoice_number": inv.get("InvoiceNumber"),
-                    "reference": inv.get("Reference"),
-                    "date": self.parse_xero_datetime(inv.get("Date")),
-                    "due_date": self.parse_xero_datetime(inv.get("DueDate")),
-                    "updated_date_utc": self.parse_xero_datetime(inv.get("UpdatedDateUTC")),
-                    "fully_paid_on_date": self.parse_xero_datetime(inv.get("FullyPaidOnDate")),
-                    "raw_payload": inv,
-                    "ingestion_timestamp": now_ts,
-                    "source_system": "XERO"
-                }
-            )
+                invoice_number=inv.get("InvoiceNumber"),
+                reference=inv.get("Reference"),
+                date=invoice_date,
+                due_date=due_date,
+                updated_date_utc=updated_date_utc,
+                fully_paid_on_date=fully_paid_on_date,
+                raw_payload=inv,
+                ingestion_timestamp=now_ts,
+                source_system="XERO",
+            ))
+            contact = inv.get("Contact", {})
             for line in inv.get('LineItems', []):
-                XeroInvoiceLineItems.objects.update_or_create(
+                line_item_rows.append(XeroInvoiceLineItems(
                     line_item_id=line['LineItemID'],
-                    invoice_id=inv['InvoiceID'],
-                    defaults={
-                        "contact_id": inv.get("Contact", {}).get("ContactID"),
-                        "contact_name": inv.get("Contact", {}).get("Name"),
-                        "reference": inv.get("Reference"),
-                        "date": self.parse_xero_datetime(inv.get("Date")),
-                        "due_date": self.parse_xero_datetime(inv.get("DueDate")),
-                        "updated_date_utc": self.parse_xero_datetime(inv.get("UpdatedDateUTC")),
-                        "fully_paid_on_date": self.parse_xero_datetime(inv.get("FullyPaidOnDate")),
-                        "invoice_number": inv.get("InvoiceNumber"),
-                        "tax_amount": line.get("TaxAmount"),
-                        "line_amount": line.get("LineAmount"),
-                        "url": inv.get("Url"),
-                        "type": inv.get("Type"),
-                        'tenant_id': self.integration.organisation.id,
-                        'description': line.get('Description'),
-                        'quantity': line.get('Quantity'),
-                        'unit_amount': line.get('UnitAmount'),
-                        'account_code': line.get('AccountCode'),
-                    }
-                )
+                    invoice_id=invoice_id,
+                    contact_id=contact.get("ContactID"),
+                    contact_name=contact.get("Name"),
+                    reference=inv.get("Reference"),
+                    date=invoice_date,
+                    due_date=due_date,
+                    updated_date_utc=updated_date_utc,
+                    fully_paid_on_date=fully_paid_on_date,
+                    invoice_number=inv.get("InvoiceNumber"),
+                    tax_amount=line.get("TaxAmount"),
+                    line_amount=line.get("LineAmount"),
+                    url=inv.get("Url"),
+                    type=inv.get("Type"),
+                    tenant_id=tenant_id,
+                    description=line.get('Description'),
+                    quantity=line.get('Quantity'),
+                    unit_amount=line.get('UnitAmount'),
+                    account_code=line.get('AccountCode'),
+                ))
 
         BatchUtils.process_in_batches(invoices, process_invoice, batch_size=10000)
+        BatchUtils.bulk_upsert(
+            XeroInvoicesRaw, invoice_rows,
+            unique_fields=["tenant_id", "invoice_id"],
+            update_fields=["invoice_number", "reference", "date", "due_date", "updated_date_utc",
+                           "fully_paid_on_date", "raw_payload", "ingestion_timestamp", "source_system"],
+        )
+        BatchUtils.bulk_upsert(
+            XeroInvoiceLineItems, line_item_rows,
+            unique_fields=["line_item_id"],
+            update_fields=INVOICE_LINE_ITEM_UPDATE_FIELDS,
+        )
+        self.save_etags(pending_etags)
         self.log_import_event(module_name="xero_invoices", fetched_records=len(invoices))
         logger.info("Completed Xero Invoices import.")
 
 
     def get_bank_transactions(self):
+        results = []
+        for bank_transactions in self.iter_bank_transaction_pages():
+            results.extend(bank_transactions)
+        return results
+
+    def iter_bank_transaction_pages(self):
+        """Yields bank transactions one page at a time."""
         url = "https://api.xero.com/api.xro/2.0/BankTransactions"
-        headers = {
-            "Authorization": f"Bearer {self.get_valid_xero_token()}",
-            "Accept": "application/json"
-        }
-        if self.since_date:
-            headers["If-Modified-Since"] = self.since_date.strftime("%a, %d %b %Y %H:%M:%S GMT")
+        headers = self.build_headers()
 
-        results = []
         page = 1
-        page_size = 1000000
+        page_size = XERO_PAGE_SIZE
 
         while True:
-            params = {"page": page}
-            response = request_with_retry("get", url, headers=headers, params=params)
-            bank_transactions = response.json().get("BankTransactions", [])
-            results.extend(bank_transactions)
+            params = {"page": page, "pageSize": page_size}
+            response = self.request("get", url, headers=headers, params=params)
+            bank_transactions = orjson.loads(response.content).get("BankTransactions", [])
+            yield bank_transactions
             if len(bank_transactions) < page_size:
                 break
             page += 1
 
-        return results
-
 
     def import_xero_bank_transactions(self):
         logger.info("Importing Xero Bank Transactions...")
         now_ts = timezone.now()
-        transactions = self.get_bank_transactions()
+        tenant_id = self.integration.organisation.id
+        total_fetched = 0
+        transaction_rows = []
+        line_item_rows = []
 
         def process_transaction(bt):
             bt_id = bt.get("BankTransactionID")
             if not bt_id:
                 logger.warning("Skipping bank transaction with no BankTransactionID.")
                 return
-            XeroBankTransactionsRaw.objects.update_or_create(
+            transaction_rows.append(XeroBankTransactionsRaw(
                 bank_transaction_id=bt_id,
-                tenant_id=self.integration.organisation.id,
-                defaults={
-                    "type": bt.get("Type"),
-                    "status": bt.get("Status"),
-                    "date": self.parse_xero_datetime(bt.get("Date")),
-                    "updated_date_utc": self.parse_xero_datetime(bt.get("UpdatedDateUTC")),
-                    "raw_payload": bt,
-                    "ingestion_timestamp": now_ts,
-                    "source_system": "XERO",
-                }
-            )
+                tenant_id=tenant_id,
+                type=bt.get("Type"),
+                status=bt.get("Status"),
+                date=self.parse_xero_datetime(bt.get("Date")),
+                updated_date_utc=self.parse_xero_datetime(bt.get("UpdatedDateUTC")),
+                raw_payload=bt,
+                ingestion_timestamp=now_ts,
+                source_system="XERO",
+            ))
             for line in bt.get('LineItems', []):
-                XeroInvoiceLineItems.objects.update_or_create(
+                line_item_rows.append(XeroInvoiceLineItems(
                     line_item_id=line['LineItemID'],
-                    defaults={
-                        'tenant_id': self.integration.organisation.id,
-                        'description': line.get('Description'),
-                        'quantity': line.get('Quantity'),
-                        'unit_amount': line.get('UnitAmount'),
-                        'account_code': line.get('AccountCode'),
-                        'tax_type': line.get('TaxType'),
-                        'tax_amount': line.get('TaxAmount'),
-                        'line_amount': line.get('LineAmount'),
-                    }
-                )
-
-        BatchUtils.process_in_batches(transactions, process_transaction, batch_size=1000)
-        self.log_import_event(module_name="xero_bank_transactions", fetched_records=len(transactions))
+                    tenant_id=tenant_id,
+                    description=line.get('Description'),
+                    quantity=line.get('Quantity'),
+                    unit_amount=line.get('UnitAmount'),
+                    account_code=line.get('AccountCode'),
+                    tax_type=line.get('TaxType'),
+                    tax_amount=line.get('TaxAmount'),
+                    line_amount=line.get('LineAmount'),
+                ))
+
+        # Write each page before fetching the next so only one page is held in memory.
+        for transactions in self.iter_bank_transaction_pages():
+            total_fetched += len(transactions)
+            BatchUtils.process_in_batches(transactions, process_transaction, batch_size=1000)
+            BatchUtils.bulk_upsert(
+                XeroBankTransactionsRaw, transaction_rows,
+                unique_fields=["tenant_id", "bank_transaction_id"],
+                update_fields=["type", "status", "date", "updated_date_utc", "raw_payload",
+                               "ingestion_timestamp", "source_system"],
+            )
+            BatchUtils.bulk_upsert(
+                XeroInvoiceLineItems, line_item_rows,
+                unique_fields=["line_item_id"],
+                update_fields=BANK_TRANSACTION_LINE_ITEM_UPDATE_FIELDS,
+            )
+            transaction_rows.clear()
+            line_item_rows.clear()
+        self.log_import_event(module_name="xero_bank_transactions", fetched_records=total_fetched)
         logger.info("Completed Xero Bank Transactions import.")
 
 
     def get_budgets(self):
+        # No ETags here: the budget list is re-read on every run so each budget's
+        # period balances can be checked against the requested date range.
         return self.get_paginated_results("https://api.xero.com/api.xro/2.0/Budgets", "Budgets")
 
 
     def get_budget_period_balances(self, budget_id: str, until_date=None):
         url = f"https://api.xero.com/api.xro/2.0/Budgets/{budget_id}"
-        headers = {
-            "Authorization": f"Bearer {self.get_valid_xero_token()}",
-            "Accept": "application/json"
-        }
+        # Budgets are fetched without If-Modified-Since, so only the cached
+        # Authorization header is reused; Accept is set on the session.
+        headers = {"Authorization": self.build_headers()["Authorization"]}
         try:
             # Convert since_date to string format if it's a date object
             date_from = self.since_date
@@ -536,11 +928,11 @@ class XeroDataImporter:
             elif date_to is None:
                 date_to = timezone.now().date().strftime("%Y-%m-%d")
             
-            response = request_with_retry("get", url, headers=headers, params={
+            response = self.request("get", url, headers=headers, params={
                 "DateFrom": date_from,
                 "DateTo": date_to
             })
-            return response.json().get("Budgets", [])
+            return orjson.loads(response.content).get("Budgets", [])
 
         except requests.exceptions.HTTPError as e:
             pass
@@ -550,31 +942,90 @@ class XeroDataImporter:
         until_date = self.until_date
         logger.info(f"Importing Xero Budgets & Period Balances from {self.since_date} to {until_date}...")
         now_ts = timezone.now()
+        organisation = self.integration.organisation
+        tenant_id = organisation.id
         budgets = self.get_budgets()
+        # (name, reporting_code, reporting_code_name) for every account of the tenant,
+        # loaded once; the reporting codes are extracted in SQL rather than from the payload.
+        accounts_map = {
+            account_id: (name, reporting_code, reporting_code_name)
+            for account_id, name, reporting_code, reporting_code_name in XeroAccountsRaw.objects.filter(
+                tenant_id=tenant_id
+            ).values_list(
+                "account_id",
+                "name",
+                KT("raw_payload__ReportingCode"),
+                KT("raw_payload__ReportingCodeName"),
+            )
+        }
+
+        def get_account_details(account_id, budget_id):
+            account = accounts_map.get(account_id)
+            if account is None:
+                logger.warning("Account %s not found for budget %s", account_id, budget_id)
+                account = accounts_map[account_id] = (None, None, None)
+            return account
+
+        # A budget whose UpdatedDateUTC hasn't moved since the last sync, and whose
+        # stored balances already span the requested months, needn't be fetched again.
+        stored_updated = dict(
+            XeroBudgetsRaw.objects.filter(tenant_id=tenant_id).values_list("budget_id", "updated_date_utc")
+        )
+        stored_periods = {
+            row["budget_id"]: (row["first_period"], row["last_period"])
+            for row in XeroBudgetPeriodBalancesRaw.objects.filter(tenant_id=tenant_id)
+            .values("budget_id")
+            .annotate(first_period=Min("period"), last_period=Max("period"))
+        }
+        first_month = str(self.since_date)[:7]
+        last_month = str(until_date or timezone.now().date())[:7]
+
+        def balances_up_to_date(budget_id, updated_date_utc):
+            previous = stored_updated.get(budget_id)
+            periods = stored_periods.get(budget_id)
+            return (
+                previous is not None
+                and updated_date_utc is not None
+                and previous >= updated_date_utc
+                and periods is not None
+                and periods[0] <= first_month
+                and periods[1] >= last_month
+            )
+
+        budget_rows = []
 
         def process_budget(budget):
             budget_id = budget.get("BudgetID")
             if not budget_id:
                 logger.warning("Skipping budget with no BudgetID.")
                 return
-            XeroBudgetsRaw.objects.update_or_create(
-                budget_id=budget_id,
-                tenant_id=self.integration.organisation.id,
-                defaults={
-                    "tenant_name": self.integration.organisation,
-                    "status": budget.get("Status"),
-                    "type": budget.get("Type"),
-                    "description": budget.get("Description"),
-                    "updated_date_utc": self.parse_xero_datetime(budget.get("UpdatedDateUTC")),
-                    "raw_payload": budget,
-                    "ingestion_timestamp": now_ts,
-                    "source_system": "XERO"
-                }
-            )
+            updated_date_utc = self.parse_xero_datetime(budget.get("UpdatedDateUTC"))
+
+            def queue_budget(stored_updated_date_utc):
+                budget_rows.append(XeroBudgetsRaw(
+                    budget_id=budget_id,
+                    tenant_id=tenant_id,
+                    tenant_name=organisation,
+                    status=budget.get("Status"),
+                    type=budget.get("Type"),
+                    description=budget.get("Description"),
+                    updated_date_utc=stored_updated_date_utc,
+                    raw_payload=budget,
+                    ingestion_timestamp=now_ts,
+                    source_system="XERO",
+                ))
+
+            if balances_up_to_date(budget_id, updated_date_utc):
+                logger.info("Budget %s unchanged since last sync, skipping period balances", budget_id)
+                queue_budget(updated_date_utc)
+                return
             bp_response = self.get_budget_period_balances(budget_id, until_date)
             if not bp_response:
-                logger.warning(f"No period balances found for budget_id: {budget_id}")
+                logger.warning("No period balances found for budget_id: %s", budget_id)
+                # Keep the previous UpdatedDateUTC so the next run fetches the balances again.
+                queue_budget(stored_updated.get(budget_id))
                 return
+            balance_rows = []
             for b_item in bp_response:
                 tracking_list = b_item.get("Tracking", [])
                 tracking_obj = tracking_list[0] if tracking_list else {}
@@ -582,54 +1033,50 @@ class XeroDataImporter:
                 for line in budget_lines:
                     account_id = line.get("AccountID")
                     account_code = line.get("AccountCode")
-                    
-                    # Initialize these variables outside the try block
-                    reporting_code = None
-                    reporting_code_name = None
-                    account_name = None
-                    
-                    try:
-                        account = XeroAccountsRaw.objects.get(
-                            tenant_id=self.integration.organisation.id,
-                            account_id=account_id
-                        )
-                        reporting_code = account.raw_payload.get("ReportingCode")
-                        reporting_code_name = account.raw_payload.get("ReportingCodeName")
-                        account_name = account.name
-                    except XeroAccountsRaw.DoesNotExist:
-                        # Log that we couldn't find the account
-                        logger.warning(f"Account {account_id} not found for budget {budget_id}")
-                    
-                    raw_balances = line.get("BudgetBalances", [])
-                    sorted_balances = sorted(raw_balances, key=lambda x: x.get("Period"))
-                    for pb in sorted_balances:
+                    account_name, reporting_code, reporting_code_name = get_account_details(account_id, budget_id)
+
+                    # Rows are upserted together keyed on period, so their order doesn't matter.
+                    for pb in line.get("BudgetBalances", []):
                         period = pb.get("Period")
                         amount = pb.get("Amount")
                         notes = pb.get("Notes")
-                        updated_date_utc = self.parse_xero_datetime(b_item.get("UpdatedDateUTC"))
-                        XeroBudgetPeriodBalancesRaw.objects.update_or_create(
+                        balance_updated_date_utc = self.parse_xero_datetime(b_item.get("UpdatedDateUTC"))
+                        balance_rows.append(XeroBudgetPeriodBalancesRaw(
                             budget_id=budget_id,
-                            tenant_id=self.integration.organisation.id,
+                            tenant_id=tenant_id,
                             account_id=account_id,
                             period=period,
-                            defaults={
-                                "tenant_name": self.integration.organisation,
-                                "account_code": account_code,
-                                "account_name": account_name,
-                                "reporting_code": reporting_code,
-                                "reporting_code_name": reporting_code_name,
-                                "amount": amount,
-                                "notes": notes,
-                                "updated_date_utc": updated_date_utc,
-                                "ingestion_timestamp": now_ts,
-                                "source_system": "XERO",
-                                "tracking_category_id": tracking_obj.get("TrackingCategoryID"),
-                                "tracking_category_name": tracking_obj.get("Name"),
-                                "tracking_category_option": tracking_obj.get("Option")
-                            }
-                        )
+                            tenant_name=organisation,
+                            account_code=account_code,
+                            account_name=account_name,
+                            reporting_code=reporting_code,
+                            reporting_code_name=reporting_code_name,
+                            amount=amount,
+                            notes=notes,
+                            updated_date_utc=balance_updated_date_utc,
+                            ingestion_timestamp=now_ts,
+                            source_system="XERO",
+                            tracking_category_id=tracking_obj.get("TrackingCategoryID"),
+                            tracking_category_name=tracking_obj.get("Name"),
+                            tracking_category_option=tracking_obj.get("Option"),
+                        ))
+
+            # All period balances of a budget go out in one upsert.
+            BatchUtils.bulk_upsert(
+                XeroBudgetPeriodBalancesRaw, balance_rows,
+                unique_fields=["tenant_id", "budget_id", "account_id", "period"],
+                update_fields=BUDGET_PERIOD_BALANCE_UPDATE_FIELDS,
+            )
+            # The budget's new UpdatedDateUTC is only stored once its balances are.
+            queue_budget(updated_date_utc)
 
         BatchUtils.process_in_batches(budgets, process_budget, batch_size=1000)
+        BatchUtils.bulk_upsert(
+            XeroBudgetsRaw, budget_rows,
+            unique_fields=["tenant_id", "budget_id"],
+            update_fields=["tenant_name", "status", "type", "description", "updated_date_utc",
+                           "raw_payload", "ingestion_timestamp", "source_system"],
+        )
         self.log_import_event(module_name="xero_budgets", fetched_records=len(budgets))
         logger.info("Completed Xero Budgets & Period Balances import.")
 
@@ -649,7 +1096,17 @@ class XeroDataImporter:
             'tracking_category_id', 'tracking_option_id', 'name', 'option'
         ).distinct()
         
-        mapping_count = 0
+        new_mappings = []
+        # Only the keys are needed to decide whether a mapping already exists.
+        mapped_option_ids = set(
+            IntegrationSiteMapping.objects.filter(
+                integration=self.integration
+            ).values_list('external_id', flat=True)
+        )
+        # Existing sites are looked up by name, so load them once up front.
+        sites_by_name = {}
+        for existing_site in Site.objects.filter(organisation=self.integration.organisation):
+            sites_by_name.setdefault(existing_site.name, existing_site)
         
         for tc in tracking_categories:
             # Skip if no valid tracking data
@@ -662,7 +1119,7 @@ class XeroDataImporter:
             tracking_category_id = tc.get('tracking_category_id')
             
             # If this doesn't represent a location, skip it
-            if category_name.lower() not in ['location', 'branch', 'site', 'store']:
+            if category_name.lower() not in SITE_TRACKING_CATEGORY_NAMES:
                 continue
             
             # Default date to use if not available - 1 year ago
@@ -670,21 +1127,13 @@ class XeroDataImporter:
             
             try:
                 # First, see if we already have a mapping for this tracking option
-                existing_mapping = IntegrationSiteMapping.objects.filter(
-                    integration=self.integration,
-                    external_id=tracking_option_id
-                ).select_related('site').first()
-                
-                if existing_mapping:
+                if tracking_option_id in mapped_option_ids:
                     # Mapping exists, update if needed
-                    logger.info(f"Existing mapping found for {site_name} ({tracking_option_id})")
+                    logger.info("Existing mapping found for %s (%s)", site_name, tracking_option_id)
                     continue
                 
                 # Check if site with this name already exists for this organisation
-                site = Site.objects.filter(
-                    organisation=self.integration.organisation,
-                    name=site_name
-                ).first()
+                site = sites_by_name.get(site_name)
                 
                 if not site:
                     # Create a new site
@@ -696,10 +1145,11 @@ class XeroDataImporter:
                         region="",    # Required field
                         opened_date=default_open_date  # Required field
                     )
+                    sites_by_name[site_name] = site
                     logger.info(f"Created new site: {site_name}")
                 
-                # Create the mapping
-                IntegrationSiteMapping.objects.create(
+                # Queue the mapping; they are inserted together below.
+                new_mappings.append(IntegrationSiteMapping(
                     site=site,
                     integration=self.integration,
                     external_id=tracking_option_id,
@@ -708,47 +1158,57 @@ class XeroDataImporter:
                         "tracking_category_id": tracking_category_id,
                         "source": "xero_tracking_category"
                     }
-                )
-                mapping_count += 1
+                ))
+                mapped_option_ids.add(tracking_option_id)
                 logger.info(f"Created mapping: {site_name} -> Xero tracking option {tracking_option_id}")
                 
             except Exception as e:
                 logger.error(f"Error mapping site {site_name}: {str(e)}", exc_info=True)
         
+        # A mapping already written by an overlapping run is skipped rather than
+        # failing the whole batch on the (site, integration, external_id) key.
+        IntegrationSiteMapping.objects.bulk_create(new_mappings, batch_size=1000, ignore_conflicts=True)
+        mapping_count = len(new_mappings)
         logger.info(f"Completed mapping {mapping_count} Xero tracking categories to sites")
         return mapping_count
 
-    @transaction.atomic
+    @staticmethod
+    def _run_in_thread(import_func):
+        """Runs an import on a worker thread and closes that thread's DB connection."""
+        try:
+            return import_func()
+        finally:
+            connections.close_all()
+
     def import_xero_data(self):
         """
         Master function to import all Xero data we care about.
+        Each import commits its own batches, so a failure part-way through
+        keeps the components that already finished.
         """
-        # 1. Accounts
-        print("Importing Xero Chart of Accounts...")
+        # 1. Accounts (budgets read them, so they go first)
+        logger.info("Importing Xero Chart of Accounts...")
         self.sync_xero_chart_of_accounts()
 
-        # 2. Journal Lines (with pagination)
-        print("Importing Xero Journal Lines...")
-        self.import_xero_journal_lines()
-
-        # 3. Contacts
-        print("Importing Xero Contacts...")
-        self.import_xero_contacts()
-
-        # 4. Invoices
-        print("Importing Xero Invoices...")
-        self.import_xero_invoices()
-
-        # 5. Bank Transactions
-        print("Importing Xero Bank Transactions...")
-        self.import_xero_bank_transactions()
-
-        # 6. Budgets
-        print("Importing Xero Budgets...")
-        self.import_xero_budgets()
+        # 2-6. Journal lines, contacts, invoices, bank transactions and budgets are
+        # independent and mostly wait on Xero, so run them side by side. Every
+        # call still goes through self.request, which caps total concurrency.
+        logger.info("Importing Xero Journal Lines, Contacts, Invoices, Bank Transactions and Budgets...")
+        with ThreadPoolExecutor(max_workers=XERO_MAX_CONCURRENT_REQUESTS) as executor:
+            futures = [
+                executor.submit(self._run_in_thread, import_func)
+                for import_func in (
+                    self.import_xero_journal_lines,
+                    self.import_xero_contacts,
+                    self.import_xero_invoices,
+                    self.import_xero_bank_transactions,
+                    self.import_xero_budgets,
+                )
+            ]
+            for future in futures:
+                future.result()
         
         # 7. Map tracking categories to sites (NEW)
-        print("Mapping Xero tracking categories to sites...")
         self.map_tracking_categories_to_sites()
 
         logger.info("Finished full Xero data import successfully.")
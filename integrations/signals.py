@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+
+from integrations.models.netsuite.analytics import (
+    NetSuiteAccountingPeriods,
+    NetSuiteDepartments,
+    NetSuiteLocations,
+    NetSuiteSubsidiaries,
+)
+
+# key_prefix for the cache_page entries of the NetSuite dimension viewsets.
+NETSUITE_DIMENSION_CACHE_PREFIX = "ns_dims"
+NETSUITE_DIMENSION_MODELS = (
+    NetSuiteAccountingPeriods,
+    NetSuiteDepartments,
+    NetSuiteLocations,
+    NetSuiteSubsidiaries,
+)
+
+
+# Connection attribute set while a cache clear is owed for the current transaction.
+PENDING_INVALIDATION_ATTR = "netsuite_dimension_cache_stale"
+
+
+def invalidate_netsuite_dimension_cache():
+    """Drops every cached page and header entry of the NetSuite dimension viewsets."""
+    # The project cache is django_redis. delete_pattern is missing only on other
+    # backends (e.g. LocMem in a test), where the entries are left to expire
+    # rather than clearing keys that have nothing to do with NetSuite.
+    if hasattr(cache, "delete_pattern"):
+        cache.delete_pattern(f"views.decorators.cache.cache_*.{NETSUITE_DIMENSION_CACHE_PREFIX}.*")
+
+
+def invalidate_if_stale():
+    """on_commit callback: clears the cache once per transaction that changed a dimension."""
+    if getattr(connection, PENDING_INVALIDATION_ATTR, False):
+        setattr(connection, PENDING_INVALIDATION_ATTR, False)
+        invalidate_netsuite_dimension_cache()
+
+
+def netsuite_dimension_changed(sender, **kwargs):
+    # Importer, admin and API writes all go through save()/delete(), so this
+    # covers every writer of these tables. Clearing after commit stops a
+    # concurrent request from caching the pre-write rows again. Only the first
+    # callback to run in a transaction clears the cache, however many rows a
+    # batched import saves; after a rollback the flag just costs one extra clear.
+    setattr(connection, PENDING_INVALIDATION_ATTR, True)
+    transaction.on_commit(invalidate_if_stale)
+
+
+for model in NETSUITE_DIMENSION_MODELS:
+    post_save.connect(netsuite_dimension_changed, sender=model)
+    post_delete.connect(netsuite_dimension_changed, sender=model)
@@ -1,7 +1,7 @@
 from celery import shared_task
 from .services.pos_sales_data_service import get_weekly_sales_and_weather
 from .services.email_service import send_weekly_sales_report as send_report_email
-from core.models import Site, Organisation
+from core.models import Site
 
 @shared_task
 def send_weekly_sales_report(recipients, site_id=None):
@@ -17,11 +17,14 @@ def send_weekly_sales_report(recipients, site_id=None):
     site_name = "Insights"
     if site_id:
         try:
-            site = Site.objects.get(id=site_id)
+            # The organisation name is only needed for the default site, but joining it
+            # here keeps the lookup to one query either way.
+            site = Site.objects.select_related('organisation').only(
+                'name', 'organisation__name'
+            ).get(id=site_id)
             site_name = site.name
             if site_name == "Default Site":
-                organisation = Organisation.objects.filter(id=site.organisation_id).first()
-                site_name = organisation.name if organisation else f"Organisation ID: {site.organisation_id}"
+                site_name = site.organisation.name
         except Site.DoesNotExist:
             site_name = "Insights"
 
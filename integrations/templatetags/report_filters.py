@@ -3,18 +3,25 @@ import builtins
 
 register = template.Library()
 
-@register.filter
+@register.filter(is_safe=True)
 def divide(value, arg):
     """
     Divides the value by the argument
     """
+    # Numbers from the report context are used as-is; only strings need float().
     try:
-        return float(value) / float(arg)
-    except (ValueError, ZeroDivisionError):
+        if not isinstance(value, (int, float)):
+            value = float(value)
+        if not isinstance(arg, (int, float)):
+            arg = float(arg)
+        return value / arg
+    except (ValueError, TypeError, ZeroDivisionError):
         return 0 
     
-@register.filter(name='abs')
+@register.filter(name='abs', is_safe=True)
 def abs_filter(value):
+    if isinstance(value, float):
+        return builtins.abs(value)
     try:
         return builtins.abs(float(value))
     except (ValueError, TypeError) as e:
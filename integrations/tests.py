@@ -1,3 +1,393 @@
-from django.test import TestCase
+import importlib
+import sqlite3
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import orjson
+import requests
+from django.db import DatabaseError
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from integrations.models.netsuite.analytics import NetSuiteGeneralLedger
+from integrations.models.xero.raw import XeroContactsRaw
+from integrations import signals
+from integrations.services.netsuite.auth import NetSuiteTokenMissing
+from integrations.views import general as general_views
+from integrations.pagination import IdCursorPagination, JournalLineCursorPagination
+from integrations.renderers import ORJSONRenderer
+from integrations.views import toast_views
+from integrations.services.netsuite import importer as netsuite_importer
+from integrations.services.toast.client import SALES_SUMMARY_VERSION_KEY, invalidate_sales_summary_cache
+from integrations.services.utils import BatchUtils
+from integrations.services.xero import xero_client
+from integrations.services.xero.xero_client import XeroDataImporter, XeroRateLimiter, XeroRetryableError
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+CONTACTS_URL = "https://api.xero.com/api.xro/2.0/Contacts"
+
+
+def xero_response(status_code=200, payload=None, etag=None, headers=None):
+    response = mock.Mock(status_code=status_code, headers={"ETag": etag} if etag else dict(headers or {}))
+    response.content = orjson.dumps(payload or {})
+    return response
+
+
+class BulkUpsertTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch("integrations.services.utils.transaction.atomic")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def contact(self, contact_id, name):
+        return XeroContactsRaw(tenant_id=1, contact_id=contact_id, name=name)
+
+    def test_last_row_wins_for_a_repeated_key(self):
+        first, other, last = self.contact("a", "first"), self.contact("b", "other"), self.contact("a", "last")
+        with mock.patch.object(XeroContactsRaw.objects, "bulk_create") as bulk_create:
+            written = BatchUtils.bulk_upsert(
+                XeroContactsRaw, [first, other, last],
+                unique_fields=["tenant_id", "contact_id"], update_fields=["name"],
+            )
+        self.assertEqual(written, 2)
+        self.assertEqual(bulk_create.call_args.args[0], [last, other])
+
+    def test_rows_are_written_in_batches(self):
+        contacts = [self.contact(str(i), str(i)) for i in range(3)]
+        with mock.patch.object(XeroContactsRaw.objects, "bulk_create") as bulk_create:
+            BatchUtils.bulk_upsert(
+                XeroContactsRaw, contacts,
+                unique_fields=["tenant_id", "contact_id"], update_fields=["name"], batch_size=2,
+            )
+        self.assertEqual([len(call.args[0]) for call in bulk_create.call_args_list], [2, 1])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class XeroETagTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        integration = mock.Mock(settings={}, organisation=mock.Mock(id=1))
+        self.importer = XeroDataImporter(integration)
+        self.importer.get_valid_xero_token = mock.Mock(return_value="token")
+        self.importer.request = mock.Mock()
+        # No database here: run on_commit callbacks straight away.
+        patcher = mock.patch.object(xero_client.transaction, "on_commit", side_effect=lambda func: func())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def sent_etags(self):
+        return [call.kwargs["headers"].get("If-None-Match") for call in self.importer.request.call_args_list]
+
+    def test_etag_is_cached_only_when_saved(self):
+        self.importer.request.return_value = xero_response(payload={"Contacts": [{}]}, etag="v1")
+        pending_etags = {}
+        self.importer.get_contacts(pending_etags)
+        self.assertIsNone(cache.get(self.importer.etag_key(CONTACTS_URL, 1)))
+
+        self.importer.save_etags(pending_etags)
+        self.assertEqual(cache.get(self.importer.etag_key(CONTACTS_URL, 1)), "v1")
+
+    def test_failed_write_leaves_etag_uncached(self):
+        self.importer.request.return_value = xero_response(
+            payload={"Contacts": [{"ContactID": "a"}]}, etag="v1"
+        )
+        with mock.patch.object(BatchUtils, "bulk_upsert", side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.importer.import_xero_contacts()
+
+        self.importer.request.reset_mock()
+        self.importer.get_contacts({})
+        self.assertEqual(self.sent_etags(), [None])
+
+    def test_unchanged_pages_end_the_walk_without_a_page_count(self):
+        cache.set(self.importer.etag_key(CONTACTS_URL, 1), "v1")
+        self.importer.request.return_value = xero_response(status_code=304)
+        self.assertEqual(self.importer.get_contacts({}), [])
+        self.assertEqual(self.importer.request.call_count, 2)
+
+    def test_unchanged_pages_are_walked_up_to_the_last_page_seen(self):
+        cache.set(self.importer.etag_key(CONTACTS_URL, "last_page"), 3)
+        self.importer.request.return_value = xero_response(status_code=304)
+        pending_etags = {}
+        self.importer.get_contacts(pending_etags)
+        self.assertEqual(self.importer.request.call_count, 3)
+        self.assertEqual(pending_etags[self.importer.etag_key(CONTACTS_URL, "last_page")], 3)
+
+    def test_budgets_do_not_send_etags(self):
+        budgets_url = "https://api.xero.com/api.xro/2.0/Budgets"
+        cache.set(self.importer.etag_key(budgets_url, 1), "v1")
+        self.importer.request.return_value = xero_response(payload={"Budgets": [{"BudgetID": "b"}]}, etag="v2")
+        self.assertEqual(self.importer.get_budgets(), [{"BudgetID": "b"}])
+        self.assertEqual(self.sent_etags(), [None])
+
+    def test_changed_page_after_unchanged_ones_is_fetched_with_a_page_count(self):
+        def run(pages):
+            self.importer.request.reset_mock()
+            self.importer.request.side_effect = lambda *args, **kwargs: pages[kwargs["params"]["page"]]
+            pending_etags = {}
+            results = self.importer.get_paginated_results(
+                CONTACTS_URL, "Contacts", extra_params={"pageSize": 1}, pending_etags=pending_etags
+            )
+            self.importer.save_etags(pending_etags)
+            return results
+
+        first_run = {
+            page: xero_response(
+                payload={"Contacts": [{"page": page}], "pagination": {"pageCount": 3}}, etag=f"v{page}"
+            )
+            for page in (1, 2, 3)
+        }
+        self.assertEqual(len(run(first_run)), 3)
+
+        second_run = {
+            1: xero_response(status_code=304),
+            2: xero_response(status_code=304),
+            3: xero_response(payload={"Contacts": [{"page": 3}]}, etag="v3b"),
+            4: xero_response(payload={"Contacts": []}),
+        }
+        self.assertEqual(run(second_run), [{"page": 3}])
+
+
+class XeroRateLimiterTests(SimpleTestCase):
+    def test_drain_holds_back_the_next_call(self):
+        limiter = XeroRateLimiter()
+        limiter.drain(60)
+        with mock.patch.object(xero_client.time, "sleep") as sleep:
+            limiter.acquire()
+        self.assertGreaterEqual(sleep.call_args.args[0], 60)
+
+    def test_minute_limit_header_drains_the_limiter(self):
+        session = mock.Mock()
+        session.request.return_value = xero_response(headers={"X-MinLimit-Remaining": "1"})
+        with mock.patch.object(xero_client, "build_xero_session", return_value=session):
+            importer = XeroDataImporter(mock.Mock(settings={}, organisation=mock.Mock(id=1)))
+            importer._rate_limiter = mock.Mock()
+            importer.request("get", CONTACTS_URL)
+        importer._rate_limiter.drain.assert_called_once_with(60)
+
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def assertMatchesJSONRenderer(self, data, accepted_media_type=None):
+        self.assertEqual(
+            ORJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_line_separators_are_escaped(self):
+        self.assertMatchesJSONRenderer({"memo": "a\u2028b\u2029c"})
+
+    def test_indent_is_honoured(self):
+        self.assertMatchesJSONRenderer({"a": [1, 2]}, "application/json; indent=4")
+
+    def test_integers_wider_than_64_bits(self):
+        self.assertMatchesJSONRenderer({"amount": 2 ** 70})
+
+
+class XeroRequestTests(SimpleTestCase):
+    def setUp(self):
+        self.session = mock.Mock()
+        patcher = mock.patch.object(xero_client, "build_xero_session", return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        integration = mock.Mock(settings={}, organisation=mock.Mock(id=1))
+        self.importer = XeroDataImporter(integration)
+        self.importer._rate_limiter = mock.Mock()
+
+    def test_rate_limit_wait_is_capped_and_taken_outside_the_request_slots(self):
+        self.session.request.side_effect = [
+            xero_response(status_code=429, headers={"Retry-After": "3600"}),
+            xero_response(),
+        ]
+        with mock.patch.object(self.importer, "_request_slots") as slots:
+            self.importer.request("get", CONTACTS_URL)
+        self.importer._rate_limiter.drain.assert_called_once_with(xero_client.XERO_MAX_RETRY_AFTER)
+        self.assertEqual(self.session.request.call_count, 2)
+        self.assertEqual(slots.__exit__.call_count, 2)
+
+    def test_daily_limit_fails_without_retrying(self):
+        response = xero_response(status_code=429, headers={"X-Rate-Limit-Problem": "day"})
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=response)
+        self.session.request.return_value = response
+        with self.assertRaises(requests.exceptions.HTTPError) as raised:
+            self.importer.request("get", CONTACTS_URL)
+        self.assertNotIsInstance(raised.exception, XeroRetryableError)
+        self.assertEqual(self.session.request.call_count, 1)
+
+
+def general_ledger_row(transaction, lineid, uniquekey):
+    return {"transaction": transaction, "lineid": lineid, "uniquekey": uniquekey}
+
+
+class GeneralLedgerImportTests(SimpleTestCase):
+    def setUp(self):
+        for target in ("NetSuiteClient", "transaction.atomic"):
+            patcher = mock.patch(f"integrations.services.netsuite.importer.{target}")
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        integration = mock.Mock(settings={"account_id": "1"}, organisation=mock.Mock(id=1))
+        self.importer = netsuite_importer.NetSuiteImporter(integration)
+        self.manager = mock.patch.object(NetSuiteGeneralLedger, "objects").start()
+        self.addCleanup(mock.patch.stopall)
+
+    def import_rows(self, rows):
+        self.importer.client.execute_suiteql.return_value = rows
+        self.importer.import_general_ledger()
+
+    def test_page_is_upserted_once_per_line_without_null_keys(self):
+        self.import_rows([
+            general_ledger_row("100", "1", "k1"),
+            general_ledger_row("100", "1", "k1"),
+            general_ledger_row("100", "2", "k2"),
+            general_ledger_row(None, "3", "k3"),
+        ])
+        written = self.manager.bulk_create.call_args.args[0]
+        self.assertEqual([(obj.transaction_id, obj.transaction_line_id) for obj in written], [("100", "1"), ("100", "2")])
+        self.assertTrue(self.manager.bulk_create.call_args.kwargs["update_conflicts"])
+
+    def test_failed_page_is_logged_not_raised(self):
+        self.manager.bulk_create.side_effect = DatabaseError
+        with self.assertLogs(netsuite_importer.logger, "ERROR") as logs:
+            self.import_rows([general_ledger_row("100", "1", "k1")])
+        self.assertIn("1 of 1 pages failed", logs.output[-1])
+
+
+class DedupeMigrationTests(SimpleTestCase):
+    """Runs the dedupe statements of the unique-key migrations against an in-memory SQLite table."""
+
+    def run_sql(self, migration, statements, table, columns, rows):
+        db = sqlite3.connect(":memory:")
+        self.addCleanup(db.close)
+        db.execute(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, {', '.join(columns)})")
+        db.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * (len(columns) + 1))})", rows)
+        statements = getattr(importlib.import_module(f"integrations.migrations.{migration}"), statements)
+        for statement in [statements] if isinstance(statements, str) else statements:
+            db.execute(statement)
+        return {row[0] for row in db.execute(f"SELECT id FROM {table}")}
+
+    def test_general_ledger_dedupe(self):
+        remaining = self.run_sql(
+            "0017_netsuitegeneralledger_unique_general_ledger_line", "DEDUPE_GENERAL_LEDGER_SQL",
+            "integrations_netsuitegeneralledger",
+            ["tenant_id", "transaction_id", "transaction_line_id", "line_unique_key"],
+            [
+                (1, 1, "100", "1", "k1"),
+                (2, 1, "1", "1", "k1"),  # same line keyed by its line id: dropped in favour of 1
+                (3, 1, "100", "2", "k2"),
+                (4, 1, "100", "2", "k2b"),  # same conflict key: the newer row is kept
+                (5, 1, None, "3", "k3"),
+                (6, 1, None, "3", "k3x"),  # NULL keys never conflict and are left alone
+                (7, 2, "100", "1", "k1"),  # another tenant
+            ],
+        )
+        self.assertEqual(remaining, {1, 4, 5, 6, 7})
+
+    def test_line_item_dedupe_keeps_the_newest_row(self):
+        remaining = self.run_sql(
+            "0019_xeroinvoicelineitems_unique_xero_line_item", "DEDUPE_LINE_ITEMS_SQL",
+            "integrations_xeroinvoicelineitems", ["line_item_id"],
+            [(1, "a"), (2, "a"), (3, "b")],
+        )
+        self.assertEqual(remaining, {2, 3})
+
+
+class DimensionCacheInvalidationTests(SimpleTestCase):
+    def setUp(self):
+        self.callbacks = []
+        patcher = mock.patch.object(signals.transaction, "on_commit", side_effect=self.callbacks.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def commit(self):
+        for callback in self.callbacks:
+            callback()
+
+    def test_cache_is_cleared_once_per_transaction(self):
+        with mock.patch.object(signals, "cache") as cache_mock:
+            signals.netsuite_dimension_changed(sender=None)
+            signals.netsuite_dimension_changed(sender=None)
+            self.commit()
+        cache_mock.delete_pattern.assert_called_once_with("views.decorators.cache.cache_*.ns_dims.*")
+
+    def test_other_cache_keys_survive_without_delete_pattern(self):
+        with mock.patch.object(signals, "cache", spec=["clear", "delete"]) as cache_mock:
+            signals.netsuite_dimension_changed(sender=None)
+            self.commit()
+        cache_mock.clear.assert_not_called()
+
+
+class IntegrationAuthViewTests(SimpleTestCase):
+    def test_missing_netsuite_token_is_a_conflict(self):
+        integration = mock.Mock(settings={"account_id": "1", "consumer_key": "key"})
+        with mock.patch.object(general_views, "Integration") as integration_model, \
+                mock.patch.object(general_views, "NetSuiteAuthService") as auth_service:
+            integration_model.objects.only.return_value.filter.return_value.first.return_value = integration
+            auth_service.return_value.get_access_token.side_effect = NetSuiteTokenMissing("No NetSuite token found.")
+            request = RequestFactory().post("/api/integrations/1/auth/")
+            response = general_views.IntegrationAuthView.as_view()(request, pk=1)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data, {"detail": "No NetSuite token found."})
+
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SalesSummaryCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(toast_views.SalesSummaryAPIView, "compute_total", side_effect=["10.00", "12.50"])
+        self.compute_total = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_total(self):
+        request = RequestFactory().get("/sales-summary/", {"startdate": "20250301", "enddate": "20250303", "option": "Netsales"})
+        return toast_views.SalesSummaryAPIView.as_view()(request).data["total"]
+
+    def test_total_is_served_from_cache_until_orders_are_imported(self):
+        self.assertEqual(self.get_total(), "10.00")
+        self.assertEqual(self.get_total(), "10.00")
+        self.assertEqual(self.compute_total.call_count, 1)
+
+        invalidate_sales_summary_cache()
+        self.assertEqual(self.get_total(), "12.50")
+        self.assertEqual(self.compute_total.call_count, 2)
+
+    def test_invalidating_before_any_request_sets_a_version(self):
+        invalidate_sales_summary_cache()
+        self.assertEqual(cache.get(SALES_SUMMARY_VERSION_KEY), 1)
+
+
+class CursorPaginationTests(SimpleTestCase):
+    def paginate(self, paginator, ordering, rows, params=None):
+        queryset = mock.MagicMock()
+        ordered = queryset.order_by.return_value
+        ordered.filter.return_value = ordered
+        ordered.__getitem__.return_value = rows
+        paginator.page_size = 2
+        page = paginator.paginate_queryset(queryset, Request(RequestFactory().get("/rows/", params or {})))
+        queryset.order_by.assert_called_once_with(ordering)
+        return page, ordered
+
+    def next_cursor(self, paginator):
+        return paginator.get_next_link().split("cursor=")[1]
+
+    def test_next_page_is_a_keyset_range_on_id(self):
+        paginator = IdCursorPagination()
+        rows = [SimpleNamespace(id=i) for i in (9, 7, 4)]
+        page, ordered = self.paginate(paginator, "-id", rows)
+        self.assertEqual(page, rows[:2])
+        ordered.filter.assert_not_called()
+        ordered.__getitem__.assert_called_once_with(slice(0, 3))
+
+        page, ordered = self.paginate(IdCursorPagination(), "-id", [SimpleNamespace(id=3)], {"cursor": self.next_cursor(paginator)})
+        ordered.filter.assert_called_once_with(id__lt="7")
+
+    def test_journal_lines_page_on_their_primary_key(self):
+        paginator = JournalLineCursorPagination()
+        rows = [SimpleNamespace(journal_line_id=key) for key in ("c", "b", "a")]
+        page, ordered = self.paginate(paginator, "-journal_line_id", rows)
+        self.assertEqual(page, rows[:2])
+
+        page, ordered = self.paginate(JournalLineCursorPagination(), "-journal_line_id", [], {"cursor": self.next_cursor(paginator)})
+        ordered.filter.assert_called_once_with(journal_line_id__lt="b")
@@ -1,6 +1,6 @@
 from rest_framework import viewsets
 from integrations.models.models import Integration, IntegrationAccessToken
-from integrations.services.netsuite.auth import NetSuiteAuthService
+from integrations.services.netsuite.auth import NetSuiteAuthService, NetSuiteTokenMissing
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -21,7 +21,8 @@ class IntegrationAuthView(APIView):
     """
 
     def post(self, request, pk=None):
-        integration = Integration.objects.filter(pk=pk).first()
+        # Credentials live in the settings JSON; nothing else on the row is needed.
+        integration = Integration.objects.only("id", "settings").filter(pk=pk).first()
         if not integration:
             return Response(
                 {"detail": "Integration not found."},
@@ -29,12 +30,14 @@ class IntegrationAuthView(APIView):
             )
         
         tokens = {}
+        integration_settings = integration.settings or {}
         
-        if integration.netsuite_account_id and integration.netsuite_consumer_key:
+        if integration_settings.get("account_id") and integration_settings.get("consumer_key"):
             service = NetSuiteAuthService(integration)
-            tokens["Netsuite Token"] = service.get_access_token()
-            authorization_url = service.get_authorization_url(state="my-netsuite-state")
-            tokens["Netsuite Auth URL"] = authorization_url
+            try:
+                tokens["Netsuite Token"] = service.get_access_token()
+            except NetSuiteTokenMissing as e:
+                return Response({"detail": str(e)}, status=status.HTTP_409_CONFLICT)
 
         # if integration.xero_client_id and integration.xero_client_secret:
         #     tokens["Xero Token"] = request_new_xero_token(integration)
@@ -6,7 +6,11 @@ from integrations.models.models import Integration
 from integrations.services.netsuite.importer import NetSuiteImporter
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_page
 from rest_framework import viewsets
+from integrations.pagination import IdCursorPagination
+from integrations.signals import NETSUITE_DIMENSION_CACHE_PREFIX
 from integrations.models.netsuite.analytics import (
     NetSuiteAccounts, NetSuiteTransactions, NetSuiteAccountingPeriods,
     NetSuiteDepartments, NetSuiteSubsidiaries, NetSuiteVendors, 
@@ -22,6 +26,24 @@ from integrations.serializers.netsuite import (
     NetSuiteTransformedTransactionSerializer, NetSuiteBudgetsSerializer, NetSuiteLocationsSerializer
 )
 
+# Dimension tables change only on import; integrations.signals clears these
+# entries whenever one of their rows is saved or deleted.
+DIMENSION_CACHE_TIMEOUT = 60 * 15
+cache_dimension_page = method_decorator(
+    cache_page(DIMENSION_CACHE_TIMEOUT, key_prefix=NETSUITE_DIMENSION_CACHE_PREFIX)
+)
+
+
+class CachedDimensionViewSet(viewsets.ModelViewSet):
+    """ModelViewSet whose list and retrieve responses are served from the cache."""
+
+    @cache_dimension_page
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_dimension_page
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
 
 class NetSuiteAccountsViewSet(viewsets.ModelViewSet):
@@ -34,17 +56,17 @@ class NetSuiteTransactionsViewSet(viewsets.ModelViewSet):
     serializer_class = NetSuiteTransactionsSerializer
     filterset_fields = ['tenant_id', 'transactionid']
 
-class NetSuiteAccountingPeriodsViewSet(viewsets.ModelViewSet):
+class NetSuiteAccountingPeriodsViewSet(CachedDimensionViewSet):
     queryset = NetSuiteAccountingPeriods.objects.all()
     serializer_class = NetSuiteAccountingPeriodsSerializer
     filterset_fields = ['tenant_id', 'period_id']
 
-class NetSuiteDepartmentsViewSet(viewsets.ModelViewSet):
+class NetSuiteDepartmentsViewSet(CachedDimensionViewSet):
     queryset = NetSuiteDepartments.objects.all()
     serializer_class = NetSuiteDepartmentsSerializer
     filterset_fields = ['tenant_id', 'department_id']
 
-class NetSuiteSubsidiariesViewSet(viewsets.ModelViewSet):
+class NetSuiteSubsidiariesViewSet(CachedDimensionViewSet):
     queryset = NetSuiteSubsidiaries.objects.all()
     serializer_class = NetSuiteSubsidiariesSerializer
     filterset_fields = ['tenant_id', 'subsidiary_id']
@@ -73,11 +95,13 @@ class NetSuiteTransactionAccountingLineViewSet(viewsets.ModelViewSet):
     queryset = NetSuiteTransactionAccountingLine.objects.all()
     serializer_class = NetSuiteTransactionAccountingLineSerializer
     filterset_fields = ['tenant_id', 'transaction', 'account']
+    pagination_class = IdCursorPagination
 
 class NetSuiteTransactionLineViewSet(viewsets.ModelViewSet):
     queryset = NetSuiteTransactionLine.objects.all()
     serializer_class = NetSuiteTransactionLineSerializer
     filterset_fields = ['tenant_id', 'transaction_line_id']
+    pagination_class = IdCursorPagination
 
 class NetSuiteTransformedTransactionViewSet(viewsets.ModelViewSet):
     queryset = NetSuiteTransformedTransaction.objects.all()
@@ -89,7 +113,7 @@ class NetSuiteBudgetsViewSet(viewsets.ModelViewSet):
     serializer_class = NetSuiteBudgetsSerializer
     filterset_fields = ['tenant_id', 'budget_id']
 
-class NetSuiteLocationsViewSet(viewsets.ModelViewSet):
+class NetSuiteLocationsViewSet(CachedDimensionViewSet):
     queryset = NetSuiteLocations.objects.all()
     serializer_class = NetSuiteLocationsSerializer
     filterset_fields = ['tenant_id', 'location_id']
@@ -1,5 +1,7 @@
 from decimal import Decimal
-from django.db.models import Sum, Case, When, Value, F, Q, DecimalField
+from django.core.cache import cache
+from django.db.models import DecimalField, Sum, F, Q, Value
+from django.db.models.functions import Coalesce, Greatest
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -10,6 +12,8 @@ from integrations.models.toast.raw import (
     ToastDiningOption, ToastServiceArea, ToastPayment
 )
 from rest_framework import viewsets
+from integrations.pagination import IdCursorPagination
+from integrations.services.toast.client import SALES_SUMMARY_VERSION_KEY
 from integrations.serializers.toast import (
     ToastOrderSerializer, ToastCheckSerializer, ToastSelectionSerializer,
     ToastGeneralLocationSerializer, ToastDayScheduleSerializer, ToastWeeklyScheduleSerializer,
@@ -18,6 +22,19 @@ from integrations.serializers.toast import (
     ToastPaymentSerializer
 )
 
+# Upper bound on how long a cached sales summary is served. Order imports
+# invalidate it sooner by bumping SALES_SUMMARY_VERSION_KEY.
+SALES_SUMMARY_CACHE_TIMEOUT = 300
+
+# ToastOrder column summed for each supported option.
+SALES_SUMMARY_FIELDS = {
+    "netsales": "order_net_sales",
+    "totalamounts": "toast_sales",
+}
+
+ZERO = Decimal("0.00")
+SALES_TOTAL_FIELD = DecimalField(max_digits=14, decimal_places=2)
+
 
 class SalesSummaryAPIView(APIView):
     """
@@ -40,7 +57,7 @@ class SalesSummaryAPIView(APIView):
             )
 
         option = option.lower()
-        if option not in ["netsales", "totalamounts"]:
+        if option not in SALES_SUMMARY_FIELDS:
             return Response(
                 {"error": "option must be either 'Netsales' or 'TotalAmounts'."},
                 status=status.HTTP_400_BAD_REQUEST
@@ -69,12 +86,36 @@ class SalesSummaryAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        version = cache.get_or_set(SALES_SUMMARY_VERSION_KEY, 1, None)
+        cache_key = f"sales-summary:{version}:{start_date}:{end_date}:{option}:{restaurant_guid or 'all'}"
+        total = cache.get_or_set(
+            cache_key,
+            lambda: self.compute_total(start_date_int, end_date_int, option, restaurant_guid),
+            SALES_SUMMARY_CACHE_TIMEOUT,
+        )
+
+        data = {
+            "startdate": start_date,
+            "enddate": end_date,
+            "option": option,
+            "total": total
+        }
+        
+        # Include restaurant_guid in the response if it was provided
+        if restaurant_guid:
+            data["restaurant_guid"] = restaurant_guid
+            
+        return Response(data, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def compute_total(start_date_int, end_date_int, option, restaurant_guid):
+        """Returns the summed total for the period as a string."""
         # Determine which field to aggregate.
-        field_name = "order_net_sales" if option == "netsales" else "toast_sales"
+        field_name = SALES_SUMMARY_FIELDS[option]
 
         # Build a base queryset with date range filters
         date_filter = Q(business_date__gte=start_date_int, business_date__lte=end_date_int) | \
-                      Q(refund_business_date__gte=str(start_date_int), refund_business_date__lte=str(end_date_int))
+                      Q(refund_business_date__gte=start_date_int, refund_business_date__lte=end_date_int)
         
         # Add restaurant_guid filter if provided
         if restaurant_guid:
@@ -82,51 +123,31 @@ class SalesSummaryAPIView(APIView):
         else:
             orders = ToastOrder.objects.filter(date_filter)
 
-        # Aggregate primary amount and refund adjustment.
-        result = orders.aggregate(
-            total_primary=Sum(
-                Case(
-                    When(business_date__gte=start_date_int, business_date__lte=end_date_int, then=F(field_name)),
-                    default=Value(Decimal("0.00")),
-                    output_field=DecimalField()
-                )
+        # Aggregate primary amount less the refund adjustment, defaulting missing
+        # sums to zero and clamping the result so it never goes negative.
+        total_primary = Coalesce(
+            Sum(
+                field_name,
+                filter=Q(business_date__gte=start_date_int, business_date__lte=end_date_int)
             ),
-            total_refund=Sum(
-                Case(
-                    # Only subtract refunds if the refund_business_date is in range and
-                    # the order's original business_date is different (i.e. the refund belongs to another day)
-                    When(
-                        Q(refund_business_date__gte=str(start_date_int)) &
-                        Q(refund_business_date__lte=str(end_date_int)) &
-                        ~Q(business_date=F('refund_business_date')),
-                        then=F('total_refunds')
-                    ),
-                    default=Value(Decimal("0.00")),
-                    output_field=DecimalField()
-                )
-            )
+            Value(ZERO),
+        )
+        # Only subtract refunds if the refund_business_date is in range and
+        # the order's original business_date is different (i.e. the refund belongs to another day)
+        total_refund = Coalesce(
+            Sum(
+                'total_refunds',
+                filter=Q(refund_business_date__gte=start_date_int) &
+                       Q(refund_business_date__lte=end_date_int) &
+                       ~Q(business_date=F('refund_business_date'))
+            ),
+            Value(ZERO),
+        )
+        result = orders.aggregate(
+            total=Greatest(total_primary - total_refund, Value(ZERO), output_field=SALES_TOTAL_FIELD)
         )
 
-        total_primary = result.get("total_primary") or Decimal("0.00")
-        total_refund = result.get("total_refund") or Decimal("0.00")
-        total_value = total_primary - total_refund
-
-        # Optional: ensure that the total does not go negative.
-        if total_value < 0:
-            total_value = Decimal("0.00")
-
-        data = {
-            "startdate": start_date,
-            "enddate": end_date,
-            "option": option,
-            "total": str(total_value)
-        }
-        
-        # Include restaurant_guid in the response if it was provided
-        if restaurant_guid:
-            data["restaurant_guid"] = restaurant_guid
-            
-        return Response(data, status=status.HTTP_200_OK)
+        return str(result["total"])
 
 class ToastOrderViewSet(viewsets.ModelViewSet):
     queryset = ToastOrder.objects.all()
@@ -142,6 +163,7 @@ class ToastSelectionViewSet(viewsets.ModelViewSet):
     queryset = ToastSelection.objects.all()
     serializer_class = ToastSelectionSerializer
     filterset_fields = ['tenant_id', 'selection_guid', 'toast_check']
+    pagination_class = IdCursorPagination
 
 class ToastGeneralLocationViewSet(viewsets.ModelViewSet):
     queryset = ToastGeneralLocation.objects.all()
@@ -192,3 +214,4 @@ class ToastPaymentViewSet(viewsets.ModelViewSet):
     queryset = ToastPayment.objects.all()
     serializer_class = ToastPaymentSerializer
     filterset_fields = ['tenant_id', 'payment_guid', 'order_guid']
+    pagination_class = IdCursorPagination
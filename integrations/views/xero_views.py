@@ -1,14 +1,8 @@
-from rest_framework.response import Response
-from rest_framework import status
-from django.shortcuts import get_object_or_404
-from integrations.services.xero.xero_client import XeroDataImporter
-from datetime import datetime
-from integrations.models.models import Integration
-from rest_framework.views import APIView
 from rest_framework import generics
 from integrations.models.xero.raw import XeroAccountsRaw
 from integrations.models.xero.transformations import XeroJournalLines, XeroJournalLineTrackingCategories, XeroInvoiceLineItems
 from rest_framework import viewsets
+from integrations.pagination import IdCursorPagination, JournalLineCursorPagination
 from integrations.models.xero.analytics import XeroBudgetPeriodBalancesAnalytics
 from integrations.models.xero.raw import (
     XeroBankTransactionsRaw, XeroBudgetPeriodBalancesRaw, XeroBudgetsRaw,
@@ -36,6 +30,7 @@ class XeroAccountsDetailView(generics.RetrieveUpdateDestroyAPIView):
 class XeroJournalLinesListCreateView(generics.ListCreateAPIView):
     queryset = XeroJournalLines.objects.all()
     serializer_class = XeroJournalLinesSerializer
+    pagination_class = JournalLineCursorPagination
 
 
 class XeroJournalLinesDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -48,6 +43,7 @@ class XeroJournalLinesViewSet(viewsets.ModelViewSet):
     queryset = XeroJournalLines.objects.all()
     serializer_class = XeroJournalLinesSerializer
     filterset_fields = ['tenant_id', 'journal_id', 'journal_date']
+    pagination_class = JournalLineCursorPagination
 
 
 class XeroBudgetPeriodBalancesAnalyticsViewSet(viewsets.ModelViewSet):
@@ -96,15 +92,18 @@ class XeroJournalsRawViewSet(viewsets.ModelViewSet):
     queryset = XeroJournalsRaw.objects.all()
     serializer_class = XeroJournalsRawSerializer
     filterset_fields = ['tenant_id', 'journal_id']
+    pagination_class = IdCursorPagination
     
 
 class XeroJournalLineTrackingCategoriesViewSet(viewsets.ModelViewSet):
     queryset = XeroJournalLineTrackingCategories.objects.all()
     serializer_class = XeroJournalLineTrackingCategoriesSerializer
     filterset_fields = ['tenant_id', 'jounal_line_id', 'tracking_category_id']
+    pagination_class = IdCursorPagination
     
     
 class XeroInvoiceLineItemsViewSet(viewsets.ModelViewSet):
     queryset = XeroInvoiceLineItems.objects.all()
     serializer_class = XeroInvoiceLineItemsSerializer
-    filterset_fields = ['tenant_id', 'invoice_id']
\ No newline at end of file
+    filterset_fields = ['tenant_id', 'invoice_id']
+    pagination_class = IdCursorPagination
\ No newline at end of file